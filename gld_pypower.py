@@ -20,8 +20,15 @@ Then the OPF runs without curtailment and the simulation is run with the new mod
 import sys
 import os
 import json
+import hashlib
+import tempfile
 import math
+import re
 import io
+import mmap
+import gzip
+import lzma
+import bz2
 import subprocess
 import numpy as np
 try:
@@ -29,10 +36,17 @@ try:
 except:
     np.Inf = np.inf
 import numpy.linalg as la
+import scipy.sparse as sp
+import scipy.sparse.linalg as sla
+from scipy.sparse import csgraph
 import cvxpy as cp
-from typing import Union, Any, TypeVar
+from typing import Union, Any, TypeVar, Iterator
 import random
+import itertools
+import functools
+import inspect
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 try:
     from pypower.api import runpf, runopf, ppoption, printpf
 except ModuleNotFoundError as err:
@@ -40,14 +54,481 @@ except ModuleNotFoundError as err:
         raise RuntimeError(f"pypower not available ({err})")
     runpf = runopf = ppoption = printpf = pypower_api
 
+# compressed file formats by extension (magic bytes, opener)
+compressors = {
+    ".gz": (b"\x1f\x8b",gzip.open),
+    ".xz": (b"\xfd7zXZ\x00",lzma.open),
+    ".bz2": (b"BZh",bz2.open),
+    }
+try:
+    import zstandard
+    compressors[".zst"] = (b"\x28\xb5\x2f\xfd",zstandard.open)
+except ModuleNotFoundError:
+    pass
+
 np.set_printoptions(linewidth=np.inf,formatter={float:lambda x:f"{x:8.4f}"})
 
 def guid():
     return hex(random.randint(0,2**64-1))[2:]
 
+def _solve_island(data:dict,method:str,kwargs:dict) -> dict:
+    """Solve an optimization on a network model (process pool worker)"""
+    return getattr(Model(data,validate=[]),method)(**kwargs)
+
+_scenario_model = None # base model of the scenarios solved by a worker process
+
+def _scenario_init(data:dict):
+    """Load the base model of the scenarios (process pool initializer)"""
+    global _scenario_model
+    _scenario_model = Model(data,validate=[])
+
+def _solve_scenario(scenario:dict,method:str,kwargs:dict) -> dict:
+    """Solve an optimization on a scenario of the base model (process pool worker)"""
+    return _scenario_model._solve_scenario(scenario,method,kwargs)
+
+def _scenario_failed(err) -> None:
+    """Failed scenario default handler"""
+    return None
+
+def _scenario_invalid(err) -> Exception:
+    """Invalid scenario default handler"""
+    return err if isinstance(err,Exception) else ValueError(err)
+
+def _compressor(file:str) -> callable:
+    """Get the opener of a compressed file from its magic bytes (None if not compressed)"""
+    with open(file,"rb") as fh:
+        head = fh.read(8)
+    for magic,opener in compressors.values():
+        if head.startswith(magic):
+            return opener
+    return None
+
+def _open_text(file:str,mode:str="r") -> TypeVar('io.TextIOWrapper'):
+    """Open a text file that may be compressed
+
+    Arguments:
+    * file: filename
+    * mode: "r" to read or "w" to write
+
+    Returns:
+    * io.TextIOWrapper: text stream
+
+    Files are read compressed when they start with the magic bytes of a
+    format in `compressors`, and written compressed when the filename has
+    the extension of one. The data is compressed and decompressed chunk by
+    chunk as the stream is read or written.
+    """
+    if mode == "r":
+        opener = _compressor(file)
+        if opener:
+            return opener(file,"rt")
+    else:
+        opener = compressors.get(os.path.splitext(file)[1],(None,None))[1]
+        if opener:
+            return opener(file,"wt")
+    return open(file,mode)
+
+def _check_properties(oclass:str,schema:frozenset,objects:dict) -> list[str]:
+    """Check the property names of objects against a class schema (process pool worker)"""
+    return [f"{oclass}.{key} is not a valid property name"
+        for data in objects.values() if not schema.issuperset(data)
+        for key in data if key not in schema]
+
 class ModelError(Exception):
     """Model error exception handler"""
 
+class _JsonReader:
+    """Incremental JSON text reader (used by the selective model loader)"""
+
+    space = re.compile(r'\s*')
+    decoder = json.JSONDecoder()
+    member = re.compile(r'\s*,?\s*"([^"\\]*)"\s*:\s*\{')
+    oclass = re.compile(r'"class"\s*:\s*"([^"\\]*)"')
+
+    def flat_member(self) -> tuple[str,str,int,int]:
+        """Read the next object member of the form "name":{...} without nested values
+
+        Returns:
+        * str: member name, or None if the next member is not complete in the buffer or is nested
+        * str: class of the member value (None if not found)
+        * int: start position of the value text in the buffer
+        * int: end position of the value text in the buffer
+
+        The value ends at the first closing brace when the text before it has
+        no opening brace, escape, or unbalanced quote, so skipping the objects
+        not loaded does not require parsing them.
+        """
+        buffer = self.buffer
+        found = self.member.match(buffer,self.pos)
+        if found is None:
+            return None,None,0,0
+        start = found.end()-1
+        stop = buffer.find("}",start)+1
+        if stop == 0 or buffer.find("{",start+1,stop) > 0 or buffer.find("\\",start,stop) > 0 or buffer.count('"',start,stop) % 2:
+            return None,None,0,0
+        oclass = self.oclass.search(buffer,start,stop)
+        if oclass is None:
+            return None,None,0,0
+        self.pos = stop
+        return found[1],oclass[1],start,stop
+
+    def __init__(self,fh:TypeVar('io.TextIOWrapper'),chunksize:int):
+        self.fh = fh
+        self.chunksize = chunksize
+        self.buffer = ""
+        self.pos = 0
+
+    def more(self) -> bool:
+        """Read the next chunk of text"""
+        chunk = self.fh.read(self.chunksize)
+        self.buffer += chunk
+        return len(chunk) > 0
+
+    def compact(self):
+        """Discard text already read"""
+        if self.pos > self.chunksize:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+
+    def peek(self) -> str:
+        """Get the next non-space character"""
+        while True:
+            self.pos = self.space.match(self.buffer,self.pos).end()
+            if self.pos < len(self.buffer) or not self.more():
+                return self.buffer[self.pos:self.pos+1]
+
+    def expect(self,char:str):
+        """Read an expected character"""
+        if self.peek() != char:
+            raise ValueError(f"expected '{char}' in JSON data")
+        self.pos += 1
+
+    def next(self,char:str) -> bool:
+        """Read a character if it is next"""
+        if self.peek() == char:
+            self.pos += 1
+            return True
+        return False
+
+    def value(self) -> tuple[Any,int]:
+        """Read the next value
+
+        Returns:
+        * varies: value
+        * int: position of the value text in the buffer
+        """
+        if not self.peek():
+            raise ValueError("unexpected end of JSON data")
+        start = self.pos
+        while True:
+            try:
+                value,self.pos = self.decoder.raw_decode(self.buffer,start)
+                if self.pos < len(self.buffer) or not self.more():
+                    return value,start
+            except json.JSONDecodeError:
+                if not self.more():
+                    raise
+
+def _load_json(fh:TypeVar('io.TextIOWrapper'),classes:list[str]=None,keep_raw:bool=False,chunksize:int=2**20) -> tuple[dict,dict]:
+    """Load a JSON model incrementally
+
+    Arguments:
+    * fh: text stream
+    * classes: classes of the objects to keep (None for all)
+    * keep_raw: keep the JSON text of the other objects
+    * chunksize: size of text chunks read
+
+    Returns:
+    * dict: model data with only the objects of the classes
+    * dict: JSON text of the other objects by name (empty unless keep_raw)
+
+    Only one chunk of text and the objects kept are held in memory. Objects
+    are located and their class found by regular expression, so only the
+    objects kept are decoded. When all objects are kept, the objects in the
+    text buffer are decoded together.
+    """
+    classes = set(classes) if classes is not None else None
+    reader = _JsonReader(fh,chunksize)
+    data = {}
+    raw = {}
+    reader.expect("{")
+    while not reader.next("}"):
+        key = reader.value()[0]
+        reader.expect(":")
+        if key == "objects":
+            objects = data[key] = {}
+            reader.expect("{")
+            while True:
+                if classes is None: # decode all the complete objects in the buffer at once
+                    start = stop = reader.pos
+                    while reader.flat_member()[0] is not None:
+                        stop = reader.pos
+                    if stop > start:
+                        objects.update(reader.decoder.raw_decode("{"+reader.buffer[start:stop].lstrip(" \t\r\n,")+"}")[0])
+                        reader.compact()
+                        continue
+                name,oclass,start,stop = reader.flat_member()
+                if name is None: # incomplete in buffer, nested, or end of objects
+                    reader.next(",")
+                    if reader.next("}"):
+                        break
+                    name = reader.value()[0]
+                    reader.expect(":")
+                    value,start = reader.value()
+                    stop = reader.pos
+                    oclass = value.get("class")
+                elif classes is None or oclass in classes:
+                    value = reader.decoder.raw_decode(reader.buffer,start)[0]
+                if classes is None or oclass in classes:
+                    objects[name] = value
+                elif keep_raw:
+                    raw[name] = reader.buffer[start:stop]
+                reader.compact()
+        else:
+            data[key] = reader.value()[0]
+        reader.compact()
+        reader.next(",")
+    return data,raw
+
+class _SnapshotObjects(dict):
+    """Object data decoded by class when first used (see `Model.load_snapshot()`)
+
+    The object names are keys from the start, in model order, with None
+    values until the objects of their class are decoded. Lookups by name
+    decode the class of the object, and methods that return all the values
+    decode all the classes.
+    """
+
+    def __init__(self,names:list[str],classes:list[str],decode:callable):
+        """Create the objects
+
+        Arguments:
+        * names: object names in model order
+        * classes: object classes in model order
+        * decode: function returning the (name,data) items of a class
+        """
+        super().__init__(dict.fromkeys(names))
+        self._classes = dict(zip(names,classes))
+        self._decode = decode
+        self._pending = set(classes)
+
+    def _load(self,oclass:str):
+        """Decode the objects of a class"""
+        if oclass in self._pending:
+            self._pending.discard(oclass)
+            for name,data in self._decode(oclass):
+                if dict.get(self,name,False) is None:
+                    dict.__setitem__(self,name,data)
+            if not self._pending:
+                self._classes = self._decode = None
+
+    def _load_all(self):
+        """Decode the objects of all classes"""
+        for oclass in list(self._pending):
+            self._load(oclass)
+
+    def __getitem__(self,name:str) -> dict:
+        data = dict.__getitem__(self,name)
+        if data is None:
+            self._load(self._classes[name])
+            data = dict.__getitem__(self,name)
+        return data
+
+    def get(self,name:str,default:Any=None) -> dict:
+        return self[name] if name in self else default
+
+    def __iter__(self):
+        # not inherited so that dict() and ** copy values with __getitem__()
+        return dict.__iter__(self)
+
+    def values(self):
+        self._load_all()
+        return dict.values(self)
+
+    def items(self):
+        self._load_all()
+        return dict.items(self)
+
+    def pop(self,*args):
+        self._load_all()
+        return dict.pop(self,*args)
+
+    def popitem(self):
+        self._load_all()
+        return dict.popitem(self)
+
+    def setdefault(self,*args):
+        self._load_all()
+        return dict.setdefault(self,*args)
+
+    def copy(self) -> dict:
+        return dict(self.items())
+
+    def __or__(self,other:dict) -> dict:
+        return self.copy() | other
+
+    def __eq__(self,other:Any) -> bool:
+        self._load_all()
+        return dict.__eq__(self,other)
+
+    def __ne__(self,other:Any) -> bool:
+        return not self == other
+
+    def __repr__(self) -> str:
+        self._load_all()
+        return dict.__repr__(self)
+
+    def __reduce__(self):
+        return (dict,(self.copy(),))
+
+class ResultCache(dict):
+    """Memory-capped result cache with least recently used eviction
+
+    Entries are kept in use order. When the total size of the entries
+    exceeds `maxbytes`, the least recently used entries are evicted, except
+    the entry just stored and other entries of the same value. Values
+    stored under several names (e.g., a solution and the last result of
+    its method) are only counted once. Only the array data held by the
+    entries is counted, and entries that only refer to data owned elsewhere
+    (e.g., model objects) can be excluded from the budget by name.
+
+    Attributes:
+    * maxbytes: memory budget in bytes (None for unlimited)
+    * borrowed: names of the entries not counted
+    * sizes: estimated size of each entry in bytes
+    * nbytes: estimated total size of the distinct values in bytes
+    * hits: number of lookups found in the cache
+    * misses: number of lookups not found in the cache
+    * evictions: number of entries evicted
+    """
+    def __init__(self,maxbytes:int=None,borrowed:list[str]=[]):
+        """Create a result cache
+
+        Arguments:
+        * maxbytes: memory budget in bytes (None for unlimited)
+        * borrowed: names of the entries not counted
+        """
+        super().__init__()
+        self.maxbytes = maxbytes
+        self.borrowed = set(borrowed)
+        self.sizes = {}
+        self.nbytes = 0
+        self._shared = {} # size and number of entries by value id
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def sizeof(value:Any) -> int:
+        """Estimate the memory used by a value
+
+        Arguments:
+        * value: value to measure
+
+        Returns:
+        * int: estimated size in bytes of the numpy array and sparse matrix
+          data held by the value (other values are not counted)
+
+        Lists are assumed to hold items of the same kind, so lists of other
+        values are not searched.
+        """
+        if isinstance(value,np.ndarray):
+            return (0 if value.base is not None else value.nbytes) \
+                + (sum(ResultCache.sizeof(x) for x in value.flat) if value.dtype == object else 0)
+        if sp.issparse(value):
+            return sum(x.nbytes for x in [value.data,getattr(value,"indices",value.data[:0]),getattr(value,"indptr",value.data[:0])])
+        if isinstance(value,dict):
+            return sum(ResultCache.sizeof(x) for x in value.values())
+        if isinstance(value,list) and value and not isinstance(value[0],(np.ndarray,dict,list,tuple)) and not sp.issparse(value[0]):
+            return 0
+        if isinstance(value,(list,tuple,set)):
+            return sum(ResultCache.sizeof(x) for x in value)
+        return 0
+
+    def __reduce__(self):
+        counters = {"hits":self.hits,"misses":self.misses,"evictions":self.evictions}
+        return (self.__class__,(self.maxbytes,self.borrowed),counters,None,iter(dict.items(self)))
+
+    def __contains__(self,name):
+        found = super().__contains__(name)
+        if not found:
+            self.misses += 1
+        return found
+
+    def __getitem__(self,name):
+        try:
+            value = super().pop(name)
+        except KeyError:
+            self.misses += 1
+            raise
+        super().__setitem__(name,value)
+        self.hits += 1
+        return value
+
+    def _add_size(self,name,value):
+        """Count the size of an entry unless its value is already stored"""
+        shared = self._shared.get(id(value))
+        if shared is None:
+            shared = self._shared[id(value)] = [0 if name in self.borrowed else self.sizeof(value),0]
+            self.nbytes += shared[0]
+        shared[1] += 1
+        self.sizes[name] = shared[0]
+
+    def _del_size(self,name):
+        """Uncount the size of an entry unless its value is still stored"""
+        key = id(super().__getitem__(name))
+        self.sizes.pop(name)
+        self._shared[key][1] -= 1
+        if self._shared[key][1] == 0:
+            self.nbytes -= self._shared.pop(key)[0]
+
+    def __setitem__(self,name,value):
+        if super().__contains__(name):
+            self._del_size(name)
+            super().__delitem__(name)
+        super().__setitem__(name,value)
+        self._add_size(name,value)
+        if self.maxbytes is not None:
+            for oldest in list(self):
+                if self.nbytes <= self.maxbytes or oldest == name:
+                    break
+                if super().__getitem__(oldest) is value:
+                    continue
+                self._del_size(oldest)
+                super().__delitem__(oldest)
+                self.evictions += 1
+
+    def __delitem__(self,name):
+        if super().__contains__(name):
+            self._del_size(name)
+        super().__delitem__(name)
+
+    def pop(self,name,*default):
+        if super().__contains__(name):
+            self._del_size(name)
+        return super().pop(name,*default)
+
+    def clear(self):
+        super().clear()
+        self.sizes.clear()
+        self._shared.clear()
+        self.nbytes = 0
+
+    def stats(self) -> dict:
+        """Get cache statistics
+
+        Returns:
+        * dict: entries, bytes, budget, hits, misses, and evictions
+        """
+        return {
+            "entries": len(self),
+            "nbytes": self.nbytes,
+            "maxbytes": self.maxbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            }
+
 class Model:
     """GridLAB-D model handler"""
 
@@ -58,48 +539,230 @@ class Model:
         int: lambda x: f"{x:8.0f}",
     }
 
+    # column types
+    dtypes = {
+        "double": float,
+        "complex": complex,
+        "int8": int,
+        "int16": int,
+        "int32": int,
+        "int64": int,
+        "bool": bool,
+    }
+
+    # object classes used by network optimizations
+    network_classes = ["bus","branch","gen","gencost","shunt","capacity"]
+
+    # object header properties only used by simulations (see `compact()`)
+    runtime_fields = ["rank","clock","valid_to","schedule_skew","rng_state","heartbeat","guid","flags"]
+
+    # indexed properties
+    indexed = ["class","parent","bus","bus_i","fbus","tbus","area"]
+
+    solution_cache_size = 16 # maximum number of cached solutions per optimization
+    result_cache_size = 256*2**20 # memory budget of cached results in bytes (None for unlimited)
+    borrowed_results = ["nodes","lines","generators","costs"] # cached results that only refer to model objects
+    validation_workers = 1 # number of processes used to validate classes (1 for none)
+
+    # class properties read by cached results (None for all, empty for only object additions and deletions)
+    dependencies = {
+        "perunitS": {},
+        "perunitV": {"bus":("baseKV",)},
+        "perunitZ": {"bus":("baseKV","bus_i"),"branch":("fbus",)},
+        "busIndex": {"bus":("bus_i",)},
+        "branchIndex": {"branch":()},
+        "lines": {"branch":None},
+        "nodes": {"bus":()},
+        "generators": {"bus":("bus_i",),"gen":None},
+        "costs": {"gencost":()},
+        "impedance": {"branch":("r","x")},
+        "graphLaplacian": {"bus":("bus_i",),"branch":("fbus","tbus","r","x")},
+        "graphIncidence": {"bus":("bus_i",),"branch":("fbus","tbus","r","x")},
+        "graphSpectral": {"bus":("bus_i",),"branch":("fbus","tbus","r","x")},
+        "graphIslands": {"bus":("bus_i",),"branch":("fbus","tbus")},
+        "demand": {"bus":("Pd","Qd")},
+        "prices": {"bus":("bus_i",),"gen":("bus",),"gencost":("parent","costs")},
+        "shunts": {"shunt":None},
+        "capacitors": {"bus":("bus_i",),"shunt":None},
+        "condensers": {"bus":("bus_i",),"shunt":None},
+        "lineratings": {"branch":("rateA","rateB","rateC")},
+        "optimal_powerflow": {"bus":None,"branch":None,"gen":None,"gencost":None,"shunt":None},
+        "optimal_sizing": {"bus":None,"branch":None,"gen":None,"gencost":None,"shunt":None},
+        }
+
     def __init__(self,
             data:str|dict|TypeVar('io.StringIO'),
             validate:list[str]=["pypower"],
+            cache_dir:str=None,
+            classes:list[str]=None,
+            keep_raw:bool=False,
+            validation:str="full",
+            compact:bool=False,
             ):
         """Create a model
 
         Arguments:
-        * data: filename, JSON data, stream, or dict
-        * validate: modules to validate
+        * data: filename, JSON data, stream, or dict (files may be compressed, see `compressors`)
+        * validate: modules that must be present
+        * cache_dir: folder in which optimization solutions are saved (None for no disk cache)
+        * classes: classes of the objects to load (None for all, see `network_classes`)
+        * keep_raw: keep the JSON text of the objects not loaded so they are saved
+        * validation: validation level ("off" to skip validation, "structural", or "full", see `validate()`)
+        * compact: compact the object data after loading (see `compact()`)
+
+        When classes are given, the JSON text is read incrementally and only the
+        objects of those classes are parsed. The other objects are discarded
+        unless keep_raw is true, in which case their text is kept in
+        `raw_objects`. Compressed files are always read incrementally, so
+        the uncompressed text is never held in memory all at once.
         """
-        if isinstance(data,str):
+        raw = {}
+        if classes is not None and not isinstance(data,dict):
+            if isinstance(data,str) and data[0] == '{':
+                data = io.StringIO(data)
+            if isinstance(data,str):
+                with _open_text(data) as fh:
+                    data,raw = _load_json(fh,classes,keep_raw)
+            else:
+                data,raw = _load_json(data,classes,keep_raw)
+        elif isinstance(data,str):
             if data[0] == '{':
                 data = json.loads(data)
             else:
-                data = json.load(open(data,"r"))
+                with _open_text(data) as fh:
+                    data = _load_json(fh)[0] if _compressor(data) else json.load(fh)
         elif isinstance(data,io.StringIO):
             data = json.load(data)
         if not isinstance(data,dict):
             raise TypeError("data is not a dict, filename, or JSON string")
         self.name = data["globals"]["modelname"]["value"]
         self.data = data
-        self.validate(validate,on_error=ModelError)
-        self.results = {}
+        self._compile_converters()
+        self._index = {x:{} for x in self.indexed}
+        self._ids = set()
+        self._next_id = 0
+        for name,values in self.data["objects"].items():
+            self._add_index(name,values)
+            self._add_id(values)
+        self._add_raw(raw)
+        self._columns = {}
+        self._refreshed = None
+        self._runtime = {}
+        self._layouts = {}
+        self._digests = None
+        self._problems = {}
+        self._solved = None
+        self.validate(validate,on_error=ModelError,level=validation,max_workers=self.validation_workers)
+        self.results = ResultCache(self.result_cache_size,self.borrowed_results)
+        self.cache_dir = cache_dir
         self.modified = False
         self._last_name = None
         self._last_data = None
+        self._last_solution = None
+        if compact:
+            self.compact()
 
     def __repr__(self):
         return f"Model({repr(self.name)})"
 
-    def validate(self,modules:str=[],on_error=None):
+    def _add_raw(self,raw:dict):
+        """Set the JSON text of the objects not loaded and reserve their ids"""
+        self.raw_objects = raw
+        self._sections_digest = None
+        for text in raw.values():
+            found = re.search(r'"id"\s*:\s*"(\d+)"',text)
+            if found:
+                self._add_id({"id":found[1]})
+
+    def compact(self,drop:list[str]=None) -> int:
+        """Compact the object data in memory
+
+        Arguments:
+        * drop: properties removed from the objects (default is `runtime_fields`)
+
+        Returns:
+        * int: number of objects from which properties were removed
+
+        Property names and values are interned, so equal strings are shared by
+        all the objects, and by all the models in the process. The dropped
+        values are kept in a separate store along with the original property
+        order, so `get_property()`, `save()`, and `save_snapshot()` restore
+        the objects exactly.
+        """
+        drop = set(self.runtime_fields if drop is None else drop) - {"id","class","parent","name"}
+        layouts = {}
+        count = 0
+        for name,data in self.data["objects"].items():
+            data = self._expand(name,data)
+            keys = tuple(sys.intern(x) for x in data)
+            keys = layouts.setdefault(keys,keys)
+            if keys not in self._layouts:
+                self._layouts[keys] = tuple(x for x in keys if x in drop)
+            if self._layouts[keys]:
+                self._runtime[name] = (keys,tuple(sys.intern(data[x]) for x in self._layouts[keys]))
+                count += 1
+            else:
+                self._runtime.pop(name,None)
+            self.data["objects"][name] = {x:sys.intern(y) if isinstance(y,str) else y
+                for x,y in zip(keys,data.values()) if x not in drop}
+        self._layouts = {x:y for x,y in self._layouts.items() if x in layouts}
+        for columns in self._columns.values():
+            for prop in drop:
+                columns.pop(prop,None)
+        self._last_name = None
+        self._last_data = None
+        return count
+
+    def _expand(self,obj:str,data:dict) -> dict:
+        """Get object data with the properties removed by `compact()`"""
+        if obj not in self._runtime:
+            return data
+        keys,values = self._runtime[obj]
+        dropped = dict(zip(self._layouts[keys],values))
+        result = {x:data[x] if x in data else dropped[x] for x in keys if x in data or x in dropped}
+        result.update(data)
+        return result
+
+    def __getstate__(self):
+        """Get the model state for copy and pickle (compiled problems are dropped)"""
+        return self.__dict__ | {"_problems":{},"_solved":None}
+
+    def _compile_converters(self):
+        """Compile the property value converter tables and class schemas
+
+        The converter for a property is the static method named by its type,
+        e.g., `double()`, or None if the value is kept as a string. Header
+        properties take precedence over class properties. The schema of a
+        class is the set of its valid property names.
+        """
+        types = {x:getattr(self,x) for x in self.data["types"] if x in dir(self)}
+        def compile(specs):
+            return {x:types.get(y["type"]) for x,y in specs.items() if isinstance(y,dict) and "type" in y}
+        header = compile(self.data["header"])
+        self._converters = {x:compile(y)|header for x,y in self.data["classes"].items()}
+        self._global_converters = compile(self.data["globals"])
+        header = frozenset(self.data["header"])
+        self._schemas = {x:frozenset(y)|header for x,y in self.data["classes"].items()}
+
+    def validate(self,modules:str=[],on_error=None,level:str="full",max_workers:int=1):
         """Validate a GridLAB-D model
 
         Arguments:
-        * model: the GridLAB-D model
-        * modules: list of modules that must be present in the model 
+        * modules: list of modules that must be present in the model
+        * on_error: exception class or function called with the errors (None to return them)
+        * level: "off" for no checks, "structural" for the application,
+          modules, and property names, or "full" to also check the module
+          object references (e.g., `validate_pypower()`)
+        * max_workers: number of processes used to check classes (1 for none)
 
         Returns:
-        * None: model contain no errors
-        * str: model contains an error
+        * list: errors found (empty if none)
         """
+        if level not in ["off","structural","full"]:
+            raise ValueError(f"validation level '{level}' is not valid")
         result = []
+        if level == "off":
+            return result
         if "application" not in self.data:
             result.append("model does not contain application name")
         elif self.data["application"] != "gridlabd":
@@ -108,13 +771,15 @@ class Model:
             for module in modules:
                 if module not in self.data["modules"]:
                     result.append(f"model does not contain module {module}")
-        for oclass in self.data["classes"]:
-            classdata = self.data["classes"][oclass]
-            for name,data in self.find(oclass,astype=dict).items():
-                for key,value in data.items():
-                    if key not in classdata and key not in self.data["header"]:
-                        result.append(f"{oclass}.{key} is not a valid property name")
-        if "pypower" in self.data["modules"]:
+        checks = [(x,self._schemas[x],self.find(x,astype=dict)) for x in self.data["classes"]]
+        if max_workers != 1 and len(checks) > 1:
+            with ProcessPoolExecutor(max_workers) as pool:
+                for errors in pool.map(_check_properties,*zip(*checks)):
+                    result.extend(errors)
+        else:
+            for check in checks:
+                result.extend(_check_properties(*check))
+        if level == "full" and "pypower" in self.data["modules"]:
             result.extend(self.validate_pypower(on_error))
 
         if not result or not on_error:
@@ -127,6 +792,92 @@ class Model:
         print(f"VALIDATION ERRORS for {self.name}:",*sorted(result),sep="\n  - ",file=sys.stderr)
         return result
 
+    def _add_index(self,obj:str,data:dict):
+        """Add an object to the property indexes"""
+        for prop,index in self._index.items():
+            if prop in data:
+                index.setdefault(data[prop],{})[obj] = None
+
+    def _reindex(self,obj:str,old:dict,data:dict):
+        """Move an object in the property indexes whose values changed
+
+        Arguments:
+        * obj: object name
+        * old: indexed property values before the change
+        * data: object data after the change
+
+        Objects keep their place in the indexes when values do not change,
+        so that `find()` keeps returning objects in model order.
+        """
+        for prop,index in self._index.items():
+            if old.get(prop) != data.get(prop):
+                self._del_index(obj,{prop:old[prop]} if prop in old else {})
+                self._add_index(obj,{prop:data[prop]} if prop in data else {})
+
+    def fingerprint(self,oclass:str=None,refresh:bool=False) -> str:
+        """Get a content fingerprint of the model or of a class
+
+        Arguments:
+        * oclass: object class (None for the whole model)
+        * refresh: digest the model sections again (e.g., after `data` is changed directly)
+
+        Returns:
+        * str: hexadecimal fingerprint
+
+        The fingerprint of a class combines the digests of its objects, which
+        are updated incrementally when objects are added, modified, or deleted,
+        so fingerprints do not depend on the order in which objects were
+        created and do not require serializing the objects. The model
+        fingerprint also includes the other model sections (e.g., globals,
+        schedules, classes, and modules) and the objects kept in
+        `raw_objects`, which are digested once when first needed. Changes
+        made directly to `data` are not tracked.
+        """
+        self._start_digests()
+        if oclass:
+            return f"{self._fingerprints.get(oclass,0):032x}"
+        if self._sections_digest is None or refresh:
+            sections = {x:y for x,y in self.data.items() if x != "objects"}
+            self._sections_digest = hashlib.blake2b(json.dumps([sections,self.raw_objects],sort_keys=True).encode(),digest_size=16).hexdigest()
+        return hashlib.blake2b(json.dumps([self.fingerprints(),self._sections_digest]).encode(),digest_size=16).hexdigest()
+
+    def fingerprints(self) -> dict:
+        """Get the content fingerprints of all classes that have objects
+
+        Returns:
+        * dict: hexadecimal fingerprint by class name
+        """
+        self._start_digests()
+        return {x:f"{y:032x}" for x,y in sorted(self._fingerprints.items()) if x in self._index["class"]}
+
+    def _start_digests(self):
+        """Compute the object digests when first needed"""
+        if self._digests is None:
+            self._digests = {}
+            self._fingerprints = {}
+            for name,data in self.data["objects"].items():
+                self._add_digest(name,data)
+
+    def _add_digest(self,obj:str,data:dict):
+        """Add an object to the content fingerprints"""
+        if self._digests is not None:
+            digest = hashlib.blake2b(json.dumps([obj,self._expand(obj,data)],sort_keys=True).encode(),digest_size=16).digest()
+            self._digests[obj] = int.from_bytes(digest,"big")
+            self._fingerprints[data["class"]] = (self._fingerprints.get(data["class"],0) + self._digests[obj]) % 2**128
+
+    def _del_digest(self,obj:str,data:dict):
+        """Remove an object from the content fingerprints"""
+        if self._digests is not None and obj in self._digests:
+            self._fingerprints[data["class"]] = (self._fingerprints[data["class"]] - self._digests.pop(obj)) % 2**128
+
+    def _del_index(self,obj:str,data:dict):
+        """Remove an object from the property indexes"""
+        for prop,index in self._index.items():
+            if prop in data and data[prop] in index:
+                index[data[prop]].pop(obj,None)
+                if not index[data[prop]]:
+                    del index[data[prop]]
+
     def modules(self) -> list[str]:
         """Return list of active modules"""
         return list(self.data["modules"])
@@ -166,18 +917,10 @@ class Model:
             self._last_data = object_data
         else:
             object_data = self._last_data
-        if name in self.data["header"]:
-            ptype = self.data["header"][name]["type"]
-            if ptype in dir(self):
-                result = getattr(self,ptype)(object_data[name])
-            else:
-                result = object_data[name]
-        else:
-            ptype = self.data["classes"][object_data["class"]][name]["type"]
-            if ptype in dir(self):
-                result = getattr(self,ptype)(object_data[name])
-            else:
-                result = object_data[name]
+        if name not in object_data and obj in self._runtime:
+            object_data = self._expand(obj,object_data)
+        convert = self._converters[object_data["class"]][name]
+        result = convert(object_data[name]) if convert else object_data[name]
 
         if astype is None or isinstance(result,astype):
             return result
@@ -198,12 +941,18 @@ class Model:
 
         return astype(result)
 
-    def set_property(self,obj,**kwargs):
+    def set_property(self,obj:str,**kwargs) -> dict:
+        """Set object properties
 
-        for name,value in kwargs.items():
-            if name in self.data["objects"]:
-                self.data["objects"][obj][name] = type(value)
-        return self.data["objects"][obj]            
+        Arguments:
+        * obj: name of object
+        * kwargs: property values (values that are not strings are given
+          the property unit, see `mod_object()`)
+
+        Returns:
+        * dict: object data
+        """
+        return self.mod_object(obj,**kwargs)
 
     def format(self,value:Any) -> str:
         """Apply formatting rules
@@ -275,11 +1024,16 @@ class Model:
         Returns:
         * list: list of object names
         * dict: object data by name
+
+        Objects are found using the class index, which is maintained by
+        `add_object()`, `mod_object()`, and `del_object()`.
         """
+        names = self._index["class"].get(oclass,{})
         if astype == list:
-            return [x for x, y in self.data["objects"].items() if y["class"] == oclass]
+            return list(names)
         elif astype == dict:
-            return {x:y for x, y in self.data["objects"].items() if y["class"] == oclass}
+            objects = self.data["objects"]
+            return {x:objects[x] for x in names}
         raise ValueError("astype is not valid")
 
     def select(self,
@@ -294,14 +1048,97 @@ class Model:
 
         Returns:
         * dict: object data by name
+
+        When `startwith` is not given, the search starts with the smallest
+        set of objects found in the indexes of the `indexed` properties
+        that appear in the criteria.
         """
         if startwith is None:
-            startwith = self.data["objects"]
+            names = []
+            for key,value in criteria.items():
+                if key in self._index:
+                    try:
+                        names.append(self._index[key].get(value,{}))
+                    except TypeError: # unhashable values are matched by the scan below
+                        pass
+            if names:
+                objects = self.data["objects"]
+                startwith = {x:objects[x] for x in min(names,key=len)}
+            else:
+                startwith = self.data["objects"]
         result = dict(startwith)
         for key,value in criteria.items():
             result = {x:y for x,y in result.items() if key in y and y[key] == value}
         return result
 
+    def _refresh_pass(method):
+        """Re-parse each column at most once in a refreshed optimization
+
+        Nested extractors called with `refresh` while the decorated method
+        runs read the columns already re-parsed in this call.
+        """
+        signature = inspect.signature(method)
+        @functools.wraps(method)
+        def wrapper(self,*args,**kwargs):
+            if self._refreshed is not None or not signature.bind(self,*args,**kwargs).arguments.get("refresh"):
+                return method(self,*args,**kwargs)
+            self._refreshed = set()
+            try:
+                return method(self,*args,**kwargs)
+            finally:
+                self._refreshed = None
+        return wrapper
+
+    def column(self,oclass:str,name:str,refresh:bool=False) -> np.array:
+        """Get a property of all objects in a class
+
+        Arguments:
+        * oclass: the object class
+        * name: the property name ("name" for object names)
+        * refresh: discard the cached columns of the class
+
+        Returns:
+        * np.array: property values in `find()` order with units removed
+
+        Columns are parsed once and cached until an object of the class is
+        modified through the model API, or refreshed (e.g., after `data` is
+        changed directly). A class is refreshed only once during a refreshed
+        optimization. Missing values are given the class default, if any, or
+        `nan` (floats), 0 (integers), or None (other types). Columns are
+        read-only.
+        """
+        if refresh and not (self._refreshed and oclass in self._refreshed):
+            self._columns.pop(oclass,None)
+            if self._refreshed is not None:
+                self._refreshed.add(oclass)
+        try:
+            return self._columns[oclass][name]
+        except KeyError:
+            pass
+        objects = self.find(oclass,dict)
+        if name == "name":
+            result = np.array(list(objects),dtype=object)
+        else:
+            if name in self.data["header"]:
+                spec = self.data["header"][name]
+            elif name in self.data["classes"][oclass]:
+                spec = self.data["classes"][oclass][name]
+            else:
+                raise ValueError(f"property '{name}' not valid in class '{oclass}'")
+            convert = self._converters[oclass][name]
+            dtype = self.dtypes.get(spec["type"],object)
+            missing = {float:np.nan,complex:np.nan,int:0,bool:False}.get(dtype)
+            default = spec["default"] if "default" in spec else None
+            if self._runtime and name in self.runtime_fields:
+                objects = {x:self._expand(x,y) for x,y in objects.items()}
+            values = [x[name] if name in x else default for x in objects.values()]
+            if convert:
+                values = [missing if x is None else convert(x) for x in values]
+            result = np.array(values,dtype=dtype)
+        result.flags.writeable = False
+        self._columns.setdefault(oclass,{})[name] = result
+        return result
+
 
     def globals(self,name:str=None) -> Union[bool,int,float,complex,str]:
         """Get global variables
@@ -316,9 +1153,62 @@ class Model:
             return list(self.data["globals"])
         if name == dict:
             return {x:self.globals(x) for x,y in self.data["globals"].items()}
-        spec = self.data["globals"][name]
-        astype = getattr(self,spec["type"]) if hasattr(self,spec["type"]) else str
-        return astype(self.data["globals"][name]["value"])
+        try:
+            astype = self._global_converters[name]
+        except KeyError:
+            spec = self.data["globals"][name]
+            astype = self._global_converters[name] = getattr(self,spec["type"]) if spec["type"] in self.data["types"] and hasattr(self,spec["type"]) else None
+        return astype(self.data["globals"][name]["value"]) if astype else str(self.data["globals"][name]["value"])
+
+    def schedule(self,name:str,times:list|np.ndarray) -> np.ndarray:
+        """Evaluate a schedule
+
+        Arguments:
+        * name: schedule name in the model `schedules` section
+        * times: times (datetimes or numpy datetime64 values)
+
+        Returns:
+        * np.ndarray: schedule values at the times
+
+        The schedule definition is a string, or a dict with a "definition"
+        string, of GridLAB-D schedule rules `minute hour day month weekday
+        value` separated by semicolons or newlines. Each time field is `*`,
+        a number, a range `a-b`, or a comma-separated list of these. Weekdays
+        are numbered from 0 (Sunday). The first rule that matches a time
+        gives its value, and times not matched by any rule are 0.
+        """
+        spec = self.data["schedules"][name]
+        if isinstance(spec,dict):
+            spec = spec["definition"]
+        times = np.asarray(times,dtype="datetime64[m]")
+        days = times.astype("datetime64[D]")
+        fields = [
+            (times - times.astype("datetime64[h]")).astype(int), # minute
+            (times.astype("datetime64[h]") - days).astype(int), # hour
+            (days - times.astype("datetime64[M]")).astype(int) + 1, # day
+            times.astype("datetime64[M]").astype(int) % 12 + 1, # month
+            (days.astype(int) + 4) % 7, # weekday (1970-01-01 is a Thursday)
+            ]
+        result = np.zeros(times.shape)
+        found = np.zeros(times.shape,dtype=bool)
+        for rule in re.split(r"[;\n]",spec.replace("{"," ").replace("}"," ")):
+            rule = rule.split()
+            if not rule:
+                continue
+            if len(rule) != 6:
+                raise ValueError(f"schedule '{name}' rule '{' '.join(rule)}' is not valid")
+            match = ~found
+            for field,values in zip(fields,rule[:5]):
+                if values == "*":
+                    continue
+                allowed = set()
+                for item in values.split(","):
+                    start,_,stop = item.partition("-")
+                    allowed.update(range(int(start),int(stop or start)+1))
+                match &= np.isin(field,list(allowed))
+            result[match] = float(rule[5])
+            found |= match
+        return result
 
     def get_result(self,name:str) -> Any:
         """Get result from cache
@@ -344,6 +1234,220 @@ class Model:
         self.results[name] = value
         return value
 
+    @staticmethod
+    def _digest(*values) -> str:
+        """Get a normalized digest of values
+
+        Arguments:
+        * values: values to digest (containers, arrays, and scalars)
+
+        Returns:
+        * str: hexadecimal digest
+
+        Dictionaries are digested in key order, integers and real arrays
+        are digested as floats, and sparse matrices as canonical CSR arrays,
+        so that equivalent values have the same digest.
+        """
+        digest = hashlib.sha1()
+        def update(value):
+            if isinstance(value,dict):
+                digest.update(b"{")
+                for key in sorted(value,key=str):
+                    update(key)
+                    update(value[key])
+                digest.update(b"}")
+            elif isinstance(value,(list,tuple)):
+                if value and all(isinstance(x,(int,float,np.integer,np.floating)) and not isinstance(x,bool) for x in value):
+                    update(np.array(value,dtype=float))
+                else:
+                    digest.update(b"[")
+                    for item in value:
+                        update(item)
+                    digest.update(b"]")
+            elif sp.issparse(value):
+                value = sp.csr_array(value,copy=True)
+                value.sum_duplicates()
+                digest.update(f"S{value.shape}".encode())
+                for item in [value.indptr,value.indices,value.data]:
+                    update(item)
+            elif isinstance(value,np.ndarray):
+                if value.dtype == object:
+                    update(value.tolist())
+                    return
+                if value.dtype.kind in "iub":
+                    value = value.astype(float)
+                digest.update(f"A{value.dtype.str}{value.shape}".encode())
+                digest.update(np.ascontiguousarray(value).tobytes())
+            elif isinstance(value,(bool,np.bool_,str)) or value is None:
+                digest.update(f"{type(value).__name__}:{value}".encode())
+            elif isinstance(value,(int,float,np.integer,np.floating)):
+                digest.update(f"f:{float(value)!r}".encode())
+            elif isinstance(value,(complex,np.complexfloating)):
+                digest.update(f"c:{complex(value)!r}".encode())
+            else:
+                digest.update(f"{type(value).__name__}:{value!r}".encode())
+        update(values)
+        return digest.hexdigest()
+
+    def _solution_name(self,method:str,args:dict,refresh:bool=False) -> str:
+        """Get the cache name of an optimization solution
+
+        Arguments:
+        * method: optimization method name
+        * args: optimization arguments that affect the solution
+        * refresh: force recalculation of model data
+
+        Returns:
+        * str: cache name, or None if the model data cannot be extracted
+
+        The name combines a digest of the arguments and of the model data
+        read by the optimizations.
+        """
+        try:
+            data = [
+                self.perunit("S",refresh),
+                self.perunit("V",refresh),
+                self.column("bus","bus_i",refresh),
+                self.column("bus","type"),
+                self.column("bus","Va"),
+                self.demand("actual",refresh),
+                self.generation("capacity",refresh),
+                self.capacitors("installed",refresh),
+                self.condensers("installed",refresh),
+                self.prices(refresh),
+                self.impedance(refresh),
+                self.column("branch","fbus",refresh),
+                self.column("branch","tbus"),
+                self.lineratings("A",refresh),
+                ]
+        except Exception:
+            return None
+        return f"{method}.{self._digest(args,data)}"
+
+    def get_solution(self,name:str) -> dict:
+        """Get a cached optimization solution
+
+        Arguments:
+        * name: solution cache name
+
+        Returns:
+        * dict: solution (the most recently used solution is kept longest)
+        """
+        return self.set_result(name.rsplit(".",1)[0],self.results[name])
+
+    def set_solution(self,method:str,name:str,value:dict) -> dict:
+        """Set a cached optimization solution
+
+        Arguments:
+        * method: optimization method name
+        * name: solution cache name (None only sets the last solution)
+        * value: solution
+
+        Returns:
+        * dict: solution stored in cache
+
+        The solution is also stored as the last result of the method, and as
+        the starting point of warm started optimizations. At most
+        `solution_cache_size` solutions are kept for each method.
+        """
+        self._last_solution = value
+        if name:
+            self.results[name] = value
+            names = [x for x in self.results if x.startswith(method+".")]
+            for x in names[:max(len(names)-self.solution_cache_size,0)]:
+                del self.results[x]
+            if self.cache_dir and not os.path.exists(os.path.join(self.cache_dir,name+".json")):
+                self.save_solution(name,value)
+        return self.set_result(method,value)
+
+    def load_solution(self,name:str) -> dict:
+        """Load an optimization solution from the disk cache
+
+        Arguments:
+        * name: solution cache name
+
+        Returns:
+        * dict: solution, or None if the solution is not in the disk cache
+        """
+        if not self.cache_dir or name is None:
+            return None
+        path = os.path.join(self.cache_dir,name)
+        try:
+            with open(path+".json","r") as fh:
+                meta = json.load(fh)
+            if meta.get("version") != 1 or meta.get("name") != name:
+                return None
+            with np.load(path+".npz",allow_pickle=False) as arrays:
+                result = {x:arrays[x] for x in meta["arrays"]}
+        except (OSError,ValueError,KeyError):
+            return None
+        result.update({x:self._decode(y) for x,y in meta["values"].items()})
+        return {x:result[x] for x in meta["order"]}
+
+    def save_solution(self,name:str,value:dict):
+        """Save an optimization solution to the disk cache
+
+        Arguments:
+        * name: solution cache name
+        * value: solution
+
+        Arrays are saved in `<name>.npz` and the other values and metadata in
+        `<name>.json`. The files are written atomically, so several processes
+        can share the same cache folder.
+        """
+        arrays = {x:y for x,y in value.items() if isinstance(y,np.ndarray) and y.dtype != object}
+        meta = {
+            "version": 1,
+            "name": name,
+            "model": self.name,
+            "order": list(value),
+            "arrays": list(arrays),
+            "values": {x:self._encode(y) for x,y in value.items() if x not in arrays},
+            }
+        os.makedirs(self.cache_dir,exist_ok=True)
+        path = os.path.join(self.cache_dir,name)
+        for ext,write in [(".npz",lambda fh:np.savez(fh,**arrays)),(".json",lambda fh:json.dump(meta,fh))]:
+            fd,tmp = tempfile.mkstemp(dir=self.cache_dir,suffix=ext)
+            try:
+                with os.fdopen(fd,"wb" if ext == ".npz" else "w") as fh:
+                    write(fh)
+                os.replace(tmp,path+ext)
+            except:
+                os.remove(tmp)
+                raise
+
+    @staticmethod
+    def _encode(value:Any) -> Any:
+        """Encode a solution value for JSON"""
+        if isinstance(value,np.generic):
+            return {"__numpy__":[value.dtype.str,Model._encode(value.item())]}
+        if isinstance(value,np.ndarray):
+            return {"__array__":[value.dtype.str,Model._encode(value.tolist())]}
+        if isinstance(value,complex):
+            return {"__complex__":[value.real,value.imag]}
+        if isinstance(value,dict):
+            return {"__dict__":[[Model._encode(x),Model._encode(y)] for x,y in value.items()]}
+        if isinstance(value,(list,tuple)):
+            return [Model._encode(x) for x in value]
+        return value
+
+    @staticmethod
+    def _decode(value:Any) -> Any:
+        """Decode a solution value from JSON"""
+        if isinstance(value,list):
+            return [Model._decode(x) for x in value]
+        if not isinstance(value,dict):
+            return value
+        if "__numpy__" in value:
+            dtype,item = value["__numpy__"]
+            return np.dtype(dtype).type(Model._decode(item))
+        if "__array__" in value:
+            dtype,items = value["__array__"]
+            return np.array(Model._decode(items),dtype=dtype)
+        if "__complex__" in value:
+            return complex(*value["__complex__"])
+        return {Model._decode(x):Model._decode(y) for x,y in value["__dict__"]}
+
     #
     # Model handling
     #
@@ -369,13 +1473,39 @@ class Model:
         Returns:
         * dict: object data
         """
+        data = self._add_object(oclass,obj,kwargs)
+        self._invalidate([oclass])
+        return data
+
+    def add_objects(self,objects:dict) -> dict:
+        """Add objects
+
+        Arguments:
+        * objects: object data by name, each including its "class"
+
+        Returns:
+        * dict: object data by name
+
+        Cached results are invalidated once after all the objects are added.
+        """
+        result = {}
+        try:
+            for obj,kwargs in objects.items():
+                kwargs = dict(kwargs)
+                result[obj] = self._add_object(kwargs.pop("class"),obj,kwargs)
+        finally:
+            self._invalidate(set(x["class"] for x in result.values()))
+        return result
+
+    def _add_object(self,oclass:str,obj:str,kwargs:dict) -> dict:
+        """Add object without invalidating cached results"""
         if oclass not in self.data["classes"]:
             raise ValueError(f"class '{oclass}' not found")
-        if obj in self.data["objects"]:
+        if obj in self.data["objects"] or obj in self.raw_objects:
             raise ValueError(f"object '{obj}' already defined")
-        if "id" in kwargs and int(kwargs["id"]) in [int(x["id"]) for x in self.data["objects"].values()]:
+        if "id" in kwargs and int(kwargs["id"]) in self._ids:
             raise ValueError(f"id '{kwargs['id']}' is already used")
-        data = {"class":oclass,"id":str(max([int(x["id"]) for x in self.data["objects"].values()])+1)}
+        data = {"class":oclass,"id":str(self._next_id)}
         classdata = self.data["classes"][oclass]
         for name,value in kwargs.items():
             if name not in classdata and name not in self.data["header"]:
@@ -397,9 +1527,10 @@ class Model:
                     raise ValueError(f"property '{name}' is required")
                 if "default" in spec:
                     data[name] = spec["default"]
-        self.modified = True
-        self.results = {}
         self.data["objects"][obj] = data
+        self._add_index(obj,data)
+        self._add_id(data)
+        self._add_digest(obj,data)
         return data
 
     def del_object(self,obj,on_ref='error',on_error='ignore'):
@@ -424,53 +1555,352 @@ class Model:
                 elif on_ref == 'error' and on_error != 'ignore':
                     raise RuntimeError("object is referenced by another object")
         del self.data["objects"][obj]
+        self._del_index(obj,result)
+        self._del_id(result)
+        self._del_digest(obj,result)
+        result = self._expand(obj,result)
+        self._runtime.pop(obj,None)
+        self._invalidate([result["class"]])
         return result
 
     def mod_object(self,obj,**kwargs):
 
         if not obj in self.data["objects"]:
             raise ValueError(f"object '{obj}' not defined")
-        if "id" in kwargs and int(kwargs["id"]) in [int(x["id"]) for x in self.data["objects"].values()]:
+        oclass = self.data["objects"][obj]["class"]
+        try:
+            return self._mod_object(obj,kwargs)
+        finally:
+            self._invalidate(self._changes({},oclass,self.data["objects"][obj]["class"],kwargs))
+
+    def mod_objects(self,objects:dict) -> dict:
+        """Modify objects
+
+        Arguments:
+        * objects: object data changes by name
+
+        Returns:
+        * dict: object data by name
+
+        Cached results are invalidated once after all the objects are modified.
+        """
+        result = {}
+        changes = {}
+        try:
+            for obj,kwargs in objects.items():
+                oclass = self.data["objects"][obj]["class"] if obj in self.data["objects"] else None
+                result[obj] = self._mod_object(obj,kwargs)
+                self._changes(changes,oclass,result[obj]["class"],kwargs)
+        finally:
+            self._invalidate(changes)
+        return result
+
+    @staticmethod
+    def _changes(changes:dict,old:str,new:str,kwargs:dict) -> dict:
+        """Accumulate the properties changed by class after an object is modified
+
+        Arguments:
+        * changes: properties changed by class (None for all properties)
+        * old: object class before the change
+        * new: object class after the change
+        * kwargs: properties changed
+
+        Returns:
+        * dict: updated changes
+        """
+        if old is None or old != new:
+            changes.update({x:None for x in [old,new] if x})
+        elif changes.get(old,set()) is not None:
+            changes[old] = changes.get(old,set()) | set(kwargs)
+        return changes
+
+    def _mod_object(self,obj:str,kwargs:dict) -> dict:
+        """Modify object without invalidating cached results"""
+        if not obj in self.data["objects"]:
+            raise ValueError(f"object '{obj}' not defined")
+        if "id" in kwargs and int(kwargs["id"]) in self._ids:
             raise ValueError(f"id '{kwargs['id']}' is already used")
         data = self.data["objects"][obj]
         classdata = self.data["classes"][data["class"]]
-        for name,value in kwargs.items():
-            if "name" in data and data["name"] != name:
-                raise ValueError(f"object name '{name}' does not match data['name']")
-            if name not in classdata and name not in self.data["header"]:
-                raise ValueError(f"property '{name}' not valid in class '{oclass}'")
-            if value is None:
-                if name in ["class","name"]:
-                    raise ValueError(f"property '{name}' cannot be deleted")
-                del data[value]
-            elif not isinstance(value,str):
-                if name in self.data["header"]:
-                    data[name] = str(value)
-                elif "unit" in classdata[name]:
-                    data[name] = f"{value} {classdata[name]['unit']}"
-                elif classdata[name]["type"] == "bool":
-                    data[name] = "TRUE" if value else "FALSE"
+        old = {x:y for x,y in data.items() if x in self._index}
+        self._del_id(data)
+        self._del_digest(obj,data)
+        try:
+            for name,value in kwargs.items():
+                if "name" in data and data["name"] != name:
+                    raise ValueError(f"object name '{name}' does not match data['name']")
+                if name not in classdata and name not in self.data["header"]:
+                    raise ValueError(f"property '{name}' not valid in class '{oclass}'")
+                if value is None:
+                    if name in ["class","name"]:
+                        raise ValueError(f"property '{name}' cannot be deleted")
+                    del data[value]
+                elif not isinstance(value,str):
+                    if name in self.data["header"]:
+                        data[name] = str(value)
+                    elif "unit" in classdata[name]:
+                        data[name] = f"{value} {classdata[name]['unit']}"
+                    elif classdata[name]["type"] == "bool":
+                        data[name] = "TRUE" if value else "FALSE"
+                    else:
+                        data[name] = str(value)
                 else:
-                    data[name] = str(value)
-            else:
-                data[name] = value
-        for name,spec in classdata.items():
-            if name not in data:
-                if "flags" in spec and "REQUIRED" in spec["flags"].split("|"):
-                    raise ValueError(f"property '{name}' is required")
-                if "default" in spec:
-                    data[name] = spec["default"]
-        self.modified = True
-        self.results = {}
+                    data[name] = value
+            for name,spec in classdata.items():
+                if name not in data:
+                    if "flags" in spec and "REQUIRED" in spec["flags"].split("|"):
+                        raise ValueError(f"property '{name}' is required")
+                    if "default" in spec:
+                        data[name] = spec["default"]
+        finally:
+            self._reindex(obj,old,data)
+            self._add_id(data)
+            self._add_digest(obj,data)
         self.data["objects"][obj] = data
         return data
 
+    def _add_id(self,data:dict):
+        """Register an object id"""
+        if "id" in data:
+            self._ids.add(int(data["id"]))
+            self._next_id = max(self._next_id,int(data["id"])+1)
+
+    def _del_id(self,data:dict):
+        """Release an object id"""
+        if "id" in data:
+            self._ids.discard(int(data["id"]))
+
+    def _invalidate(self,classes:list[str]|dict):
+        """Invalidate cached results after objects in classes are changed
+
+        Arguments:
+        * classes: changed classes, or changed properties by class (None
+          when objects are added or deleted)
+
+        Only the cached results that read the changed properties according
+        to `dependencies` are discarded. Results not listed there are always
+        discarded.
+        """
+        if not classes:
+            return
+        if not isinstance(classes,dict):
+            classes = dict.fromkeys(classes)
+        self.modified = True
+        for name in [x for x in self.results if self._depends(x,classes)]:
+            del self.results[name]
+        for oclass,props in classes.items():
+            if props is None:
+                self._columns.pop(oclass,None)
+            else:
+                for prop in props:
+                    self._columns.get(oclass,{}).pop(prop,None)
+
+    def _depends(self,name:str,classes:dict) -> bool:
+        """Check whether a cached result depends on changed properties
+
+        Arguments:
+        * name: cached result name
+        * classes: changed properties by class (None when objects are added or deleted)
+
+        Returns:
+        * bool: cached result reads at least one changed property
+        """
+        reads = self.dependencies.get(name.split(".")[0])
+        if reads is None:
+            return True
+        for oclass,props in classes.items():
+            if oclass in reads and (props is None or reads[oclass] is None or set(props) & set(reads[oclass])):
+                return True
+        return False
+
     def save(self,name=None,**kwargs):
+        """Save the model
+
+        Arguments:
+        * name: filename (default is model name)
+        * kwargs: options passed to `json.dump()`
 
-        with open(name if name else self.name,"w") as fh:
-            json.dump(self.data,fh,**kwargs)
+        Objects kept in `raw_objects` are saved verbatim after the loaded
+        objects, and properties removed by `compact()` are restored. The file is compressed when the name has the extension of a
+        format in `compressors`, e.g., `.json.gz`.
+        """
+        with _open_text(name if name else self.name,"w") as fh:
+            if self.raw_objects or self._runtime:
+                fh.write("{")
+                for n,(key,value) in enumerate(self.data.items()):
+                    fh.write(f"{',' if n else ''}{json.dumps(key)}:")
+                    if key == "objects":
+                        fh.write("{")
+                        for m,(obj,text) in enumerate([*value.items(),*self.raw_objects.items()]):
+                            text = json.dumps(self._expand(obj,text),**kwargs) if obj in value else text
+                            fh.write(f"{',' if m else ''}{json.dumps(obj)}:{text}")
+                        fh.write("}")
+                    else:
+                        json.dump(value,fh,**kwargs)
+                fh.write("}")
+            else:
+                json.dump(self.data,fh,**kwargs)
         self.modified = False
 
+    snapshot_magic = b"GLDSNAP1"
+
+    def save_snapshot(self,file:str):
+        """Save the model in a binary snapshot
+
+        Arguments:
+        * file: snapshot filename
+
+        The snapshot contains a JSON header with the model sections other
+        than the objects, followed by 64-byte aligned array sections: a table
+        of the unique strings, the string codes of the object names and
+        property values by class, and the typed property columns. Loading a
+        snapshot maps the arrays from the file instead of parsing JSON.
+        """
+        strings = {}
+        def codes(values):
+            return np.array([-1 if x is None else strings.setdefault(x,len(strings)) for x in values],dtype=np.int32)
+        objects = {}
+        for name,data in self.data["objects"].items():
+            objects.setdefault(data["class"],[]).append((name,self._expand(name,data)))
+        classlist = list(objects)
+        sections = {
+            "objects/class":np.array([classlist.index(x["class"]) for x in self.data["objects"].values()],dtype=np.int32),
+            "objects/id":np.array([int(x.get("id",-1)) for x in self.data["objects"].values()],dtype=np.int64),
+            }
+        classes = {}
+        for oclass,items in objects.items():
+            props = classes[oclass] = list(dict.fromkeys(x for _,data in items for x in data))
+            sections[f"names/{oclass}"] = codes(x for x,_ in items)
+            sections[f"values/{oclass}"] = np.array([codes(data.get(x) for x in props) for _,data in items],dtype=np.int32).reshape(len(items),len(props))
+            for prop in props:
+                spec = self.data["header"].get(prop,self.data["classes"].get(oclass,{}).get(prop))
+                if isinstance(spec,dict) and self.dtypes.get(spec.get("type"),object) is not object:
+                    try:
+                        sections[f"column/{oclass}/{prop}"] = self.column(oclass,prop)
+                    except Exception:
+                        pass
+        if self.raw_objects:
+            sections["raw/names"] = codes(self.raw_objects)
+            sections["raw/text"] = codes(self.raw_objects.values())
+        encoded = [x.encode() for x in strings]
+        sections["strings/offsets"] = np.cumsum([0]+[len(x) for x in encoded],dtype=np.int64)
+        sections["strings/data"] = np.frombuffer(b"".join(encoded),dtype=np.uint8)
+
+        layout = {}
+        offset = 0
+        for name,array in sections.items():
+            layout[name] = {"dtype":array.dtype.str,"shape":list(array.shape),"offset":offset}
+            offset += -(-array.nbytes//64)*64
+        header = json.dumps({
+            "version": 1,
+            "model": {x:(None if x == "objects" else y) for x,y in self.data.items()},
+            "classes": classes,
+            "sections": layout,
+            }).encode()
+        start = -(-(16+len(header))//64)*64
+        with open(file,"wb") as fh:
+            fh.write(self.snapshot_magic)
+            fh.write(len(header).to_bytes(8,"little"))
+            fh.write(header)
+            for name,array in sections.items():
+                fh.write(bytes(start+layout[name]["offset"]-fh.tell()))
+                fh.write(np.ascontiguousarray(array).data)
+
+    @classmethod
+    def load_snapshot(cls,file:str,validation:str="off",**kwargs):
+        """Load a model from a binary snapshot
+
+        Arguments:
+        * file: snapshot filename
+        * validation: validation level (see `Model()`)
+        * kwargs: other model options (see `Model()`)
+
+        Returns:
+        * Model: model
+
+        The typed property columns are read-only views of the memory-mapped
+        file, so processes loading the same snapshot share their pages. Only
+        the object names and indexed properties are decoded when the snapshot
+        is loaded. The data of the objects of a class is decoded when an
+        object of the class is first used (e.g., by `find()` or
+        `get_property()`), and the data of all objects when they are all
+        used (e.g., by `save()` or validation).
+        """
+        compact = kwargs.pop("compact",False)
+        validate = kwargs.pop("validate",["pypower"])
+        with open(file,"rb") as fh:
+            buffer = mmap.mmap(fh.fileno(),0,access=mmap.ACCESS_READ)
+        if buffer[:8] != cls.snapshot_magic:
+            raise ModelError(f"{file} is not a model snapshot")
+        size = int.from_bytes(buffer[8:16],"little")
+        header = json.loads(buffer[16:16+size])
+        start = -(-(16+size)//64)*64
+        def section(name):
+            spec = header["sections"][name]
+            return np.frombuffer(buffer,dtype=spec["dtype"],count=math.prod(spec["shape"]),
+                offset=start+spec["offset"]).reshape(spec["shape"])
+        offsets = section("strings/offsets")
+        text = start+header["sections"]["strings/data"]["offset"]
+        strings = np.full(len(offsets),None,dtype=object) # decoded strings by code (-1 for None)
+        decoded = np.zeros(len(offsets),dtype=bool)
+        decoded[-1] = True
+        def decode(codes):
+            codes = np.asarray(codes)
+            missing = np.unique(codes[~decoded[codes]])
+            strings[missing] = [buffer[text+x:text+y].decode() for x,y in zip(offsets[missing].tolist(),offsets[missing+1].tolist())]
+            decoded[missing] = True
+            return strings[codes]
+        def objects(oclass):
+            props = header["classes"][oclass]
+            values = decode(section(f"values/{oclass}")).tolist()
+            return zip(decode(section(f"names/{oclass}")).tolist(),
+                [{x:y for x,y in zip(props,row) if y is not None} for row in values])
+
+        # object names, classes, and indexed properties in model order
+        classlist = list(header["classes"])
+        order = section("objects/class")
+        names = np.empty(len(order),dtype=np.int32)
+        rows = {x:np.flatnonzero(order == n) for n,x in enumerate(classlist)}
+        for oclass,found in rows.items():
+            names[found] = section(f"names/{oclass}")
+        names = decode(names)
+        def codes(prop):
+            result = np.full(len(order),-1,dtype=np.int32)
+            for oclass,found in rows.items():
+                if prop in header["classes"][oclass]:
+                    result[found] = section(f"values/{oclass}")[:,header["classes"][oclass].index(prop)]
+            return result
+
+        data = {x:({} if x == "objects" else y) for x,y in header["model"].items()}
+        model = cls(data,validation="off",**kwargs)
+        model.data["objects"] = _SnapshotObjects(names.tolist(),np.array(classlist,dtype=object)[order].tolist(),objects)
+        for prop in model.indexed:
+            values = codes(prop)
+            found = np.flatnonzero(values >= 0)
+            found = found[np.argsort(values[found],kind="stable")]
+            unique,first = np.unique(values[found],return_index=True)
+            groups = np.split(names[found],first[1:]) if len(found) else []
+            keys = decode(unique).tolist()
+            for n in np.argsort(found[first],kind="stable").tolist():
+                model._index[prop][keys[n]] = dict.fromkeys(groups[n].tolist())
+        if "objects/id" in header["sections"]:
+            ids = section("objects/id")
+            ids = ids[ids >= 0].tolist()
+        else:
+            ids = [int(x) for x in decode(np.unique(codes("id"))).tolist() if x is not None]
+        model._ids = set(ids)
+        model._next_id = max(ids)+1 if ids else 0
+        if "raw/names" in header["sections"]:
+            model._add_raw(dict(zip(decode(section("raw/names")).tolist(),decode(section("raw/text")).tolist())))
+        for name in header["sections"]:
+            if name.startswith("column/"):
+                oclass,prop = name.split("/",2)[1:]
+                model._columns.setdefault(oclass,{})[prop] = section(name)
+        model.validate(validate,on_error=ModelError,level=validation,max_workers=model.validation_workers)
+        if compact:
+            model.compact()
+        return model
+
     def run(self,name=None,binary="GLD_ETC" in os.environ,exception=True,*args,**kwargs):
         if self.modified:
             raise RuntimeError("model has been modified")
@@ -505,7 +1935,7 @@ class Model:
         }
         for oclass,checks in checklist.items():
             for prop,pclass in checks.items():
-                objlist = self.find(pclass)
+                objlist = self._index["class"].get(pclass,{})
                 for name,data in self.find(oclass,astype=dict).items():
                     if prop not in data:
                         result.append(f"'{prop}' not found in {oclass} '{name}'")
@@ -523,20 +1953,98 @@ class Model:
 
         Arguments:
         * kind: 'bus' or 'branch'
-        * id: bus/branch index
+        * id: bus/branch index, or list or array of indexes
+
+        Returns:
+        * str: name of bus/branch at index id
+        * list[str]: list of names of busses/branches at indexes id (in the order given)
+        """
+        if isinstance(id,(int,np.integer)):
+            return self.column(kind,"name")[id]
+        elif isinstance(id,(list,np.ndarray)):
+            return self.column(kind,"name")[np.asarray(id,dtype=int)].tolist()
+        elif id is None:
+            return self.find(kind,list)
+        else:
+            raise TypeError("id must be an int, list, array, or None")
+
+    def get_index(self,kind:str,name:str|list[str],refresh:bool=False) -> int|np.ndarray:
+        """Get bus/branch index
+
+        Arguments:
+        * kind: 'bus' or 'branch'
+        * name: bus/branch name, or list of names
+        * refresh: force recalculation of the lookup tables
 
         Returns:
-        * str: name of bus/branch at index id
-        * list[str]: list of names of busses/branches at indexes id
+        * int: index of the bus/branch
+        * np.ndarray: indexes of the busses/branches
         """
-        if isinstance(id,int):
-            return self.find(kind,list)[id]
-        elif isinstance(id,list):
-            return [x for n,x in enumerate(self.find(kind,list)) if n in id]
-        elif id is None:
-            return self.find(kind,list)
+        names = self._lookup(kind,refresh)["names"]
+        try:
+            if isinstance(name,str):
+                return names[name]
+            return np.array([names[x] for x in name],dtype=int)
+        except KeyError as err:
+            raise ValueError(f"{kind} {err} not found") from None
+
+    def bus_index(self,bus_i:int|list[int]|np.ndarray,refresh:bool=False) -> int|np.ndarray:
+        """Get bus index from bus numbers
+
+        Arguments:
+        * bus_i: bus number, or list or array of bus numbers
+        * refresh: force recalculation of the lookup tables
+
+        Returns:
+        * int: index of the bus
+        * np.ndarray: indexes of the busses
+
+        Bus numbers need not be contiguous or start at 1. The bus number of
+        an index is given by `column("bus","bus_i")`.
+        """
+        lookup = self._lookup("bus",refresh)
+        numbers = np.asarray(bus_i,dtype=int)
+        if "table" in lookup:
+            table = lookup["table"]
+            offset = numbers - lookup["offset"]
+            found = (offset >= 0) & (offset < len(table))
+            result = np.where(found,table[np.where(found,offset,0)] if len(table) else -1,-1)
         else:
-            raise TypeError("id must be an int, list, or None")
+            order,ordered = lookup["order"],lookup["sorted"]
+            offset = np.minimum(np.searchsorted(ordered,numbers),max(len(ordered)-1,0))
+            result = np.where(ordered[offset] == numbers,order[offset],-1) if len(ordered) else np.full(numbers.shape,-1)
+        if (result < 0).any():
+            raise ValueError(f"bus {numbers[result < 0].tolist()} not found")
+        return int(result) if result.ndim == 0 else result
+
+    def _lookup(self,kind:str,refresh:bool=False) -> dict:
+        """Get the cached index lookup tables of busses or branches
+
+        The names are mapped to indexes with a dict. Bus numbers are mapped
+        with a table indexed by bus number when they are dense enough, or else
+        by binary search of the sorted bus numbers.
+        """
+        name = f"{kind}Index"
+        if name in self.results and not refresh:
+            return self.results[name]
+        if kind not in ["bus","branch"]:
+            raise ValueError(f"kind '{kind}' is invalid")
+        result = {"names":{x:n for n,x in enumerate(self.find(kind,list))}}
+        if kind == "bus":
+            numbers = self.column("bus","bus_i",refresh)
+            if len(np.unique(numbers)) < len(numbers):
+                raise ModelError("bus numbers are not unique")
+            offset = int(numbers.min()) if len(numbers) else 0
+            span = int(numbers.max())-offset+1 if len(numbers) else 0
+            if span <= 4*len(numbers)+1024:
+                result["offset"] = offset
+                result["table"] = np.full(span,-1,dtype=int)
+                result["table"][numbers-offset] = np.arange(len(numbers))
+            else:
+                result["order"] = np.argsort(numbers,kind="stable")
+                result["sorted"] = numbers[result["order"]]
+        self.results[name] = result
+        return result
 
     def get_bus(self,name:str|list) -> str|list:
         """Get bus name
@@ -561,21 +2069,23 @@ class Model:
     def get_areas(self) -> list:
         return list(set([x["area"] for x in self.find("bus",dict).values()]))
 
-    def perunit(self,kind:str,refresh:bool=True) -> Union[list,float]:
+    def perunit(self,kind:str,refresh:bool=False) -> Union[list,float]:
         """Get the per-unit values in the pypower model
 
         Arguments:
+        * kind: 'S', 'V', or 'Z'
+        * refresh: force recalculation of previous results
         """
         self.assert_module("pypower")
-        if "perunit"+kind in self.results:
+        if "perunit"+kind in self.results and not refresh:
             return self.results["perunit"+kind]
         elif kind == 'S':
             self.results["perunit"+kind] = self.globals("pypower::baseMVA")
         elif kind == 'V':
-            self.results["perunit"+kind] = [self.get_property(x,"baseKV") for x in self.find("bus")]
+            self.results["perunit"+kind] = self.column("bus","baseKV",refresh).tolist()
         elif kind == 'Z':
-            names = {y["bus_i"]:x for x,y in self.find("bus").items()}
-            self.results["perunit"+kind] = [self.get_property(names[x["fbus"]],"baseKV")**2/self.globals("pypower::baseMVA") for x in self.find("branch",dict).values()]
+            baseKV = self.column("bus","baseKV",refresh)[self.bus_index(self.column("branch","fbus",refresh),refresh)]
+            self.results["perunit"+kind] = (baseKV**2/self.globals("pypower::baseMVA")).tolist()
         else:
             raise ValueError("invalid kind")
         return self.results["perunit"+kind]
@@ -658,55 +2168,77 @@ class Model:
         self.assert_module("pypower")
         if "impedance" in self.results and not refresh:
             return self.results["impedance"]
-        self.results["impedance"] = [complex(self.get_property(x,"r"),self.get_property(x,"x")) for x in self.lines(refresh)]
+        self.results["impedance"] = (self.column("branch","r",refresh)+self.column("branch","x")*1j).tolist()
         return self.results["impedance"]
 
-    def graphLaplacian(self,refresh:bool=False) -> np.array:
+    def graphLaplacian(self,refresh:bool=False,sparse:bool=False) -> np.array:
         """Get network graph Laplacian
 
         Arguments:
         * refresh: force recalculation of previous results
+        * sparse: return a sparse (CSR) matrix
 
         Returns:
         * np.array: graph Laplacian matrix
         """
-        if "graphLaplacian" in self.results and not refresh:
-            return self.results["graphLaplacian"]
+        cachename = "graphLaplacian.sparse" if sparse else "graphLaplacian"
+        if cachename in self.results and not refresh:
+            return self.results[cachename]
         self.assert_module("pypower")
-        lines = self.lines(refresh)
         N = len(self.nodes(refresh))
-        B = np.array([[int(x["fbus"])-1,int(x["tbus"])-1] for x in lines.values()])
-        R = self.impedance(refresh)
-        G = np.zeros((N,N),dtype=complex)
-        for n, l in enumerate(B):
-            G[l[0], l[1]] = G[l[1], l[0]] = ( 1 / R[n] ) if abs(R[n]) > 0 else 1e6
-        self.results["graphLaplacian"] = np.diag(sum(G)) - G # graph Laplacian
-        return self.results["graphLaplacian"]
+        F = self.bus_index(self.column("branch","fbus",refresh),refresh)
+        T = self.bus_index(self.column("branch","tbus"))
+        Y = np.array([( 1 / x ) if abs(x) > 0 else 1e6 for x in self.impedance(refresh)],dtype=complex)
+
+        # node-node admittances (the last of parallel branches is used)
+        rows = np.stack([F,T],axis=1).ravel()
+        cols = np.stack([T,F],axis=1).ravel()
+        _,last = np.unique((rows*N+cols)[::-1],return_index=True)
+        keep = len(rows)-1-last
+        rows,cols,values = rows[keep],cols[keep],np.repeat(Y,2)[keep]
+
+        if sparse:
+            G = sp.csr_matrix((values,(rows,cols)),shape=(N,N))
+            self.results[cachename] = (sp.diags(np.asarray(G.sum(axis=0)).ravel()) - G).tocsr() # graph Laplacian
+        else:
+            G = np.zeros((N,N),dtype=complex)
+            G[rows,cols] = values
+            self.results[cachename] = np.diag(sum(G)) - G # graph Laplacian
+        return self.results[cachename]
  
-    def graphIncidence(self,refresh:bool=False, complex_flows:bool = True, weighted:bool=True) -> np.array:
+    def graphIncidence(self,refresh:bool=False, complex_flows:bool = True, weighted:bool=True, sparse:bool=False) -> np.array:
         """Get network indicidence matrix
 
         Arguments:
         * refresh: force recalculation of previous results
         * complex: if true produces a complex incidence matrix 
+        * weighted: weight incidence by line admittance
+        * sparse: return a sparse (CSR) matrix
 
         Returns:
         * np.array: incidence matrix
         """
-        cachename = f"graphIncidence.{'weighted' if weighted else 'unweighted'}"
+        cachename = f"graphIncidence.{'weighted' if weighted else 'unweighted'}{'.sparse' if sparse else ''}"
         if cachename in self.results and not refresh:
             return self.results[cachename]
         self.assert_module("pypower")
-        lines = self.find("branch")
         N = len(self.find("bus",list))
-        L = len(lines)
-        B = np.array([[int(x["fbus"])-1,int(x["tbus"])-1] for x in lines.values()])
-        Y = [1/(self.get_property(x,"r")+self.get_property(x,"x")*1j) for x in lines] if weighted else np.ones(L,dtype=complex)
-        I = np.zeros((L, N),dtype=complex)  # link-node incidence matrix
-        
-        for n, l in enumerate(B):
-            I[n][l[0]] = -Y[n] 
-            I[n][l[1]] = Y[n]
+        L = len(self.find("branch",list))
+        F = self.bus_index(self.column("branch","fbus",refresh),refresh)
+        T = self.bus_index(self.column("branch","tbus"))
+        Y = np.array([1/x for x in self.impedance(refresh)],dtype=complex) if weighted else np.ones(L,dtype=complex)
+        n = np.arange(L)
+
+        if sparse:
+            loop = (F == T) # a line to itself only keeps its tbus entry
+            rows = np.concatenate([n[~loop],n])
+            cols = np.concatenate([F[~loop],T])
+            values = np.concatenate([-Y[~loop],Y])
+            I = sp.csr_matrix((values,(rows,cols)),shape=(L,N))  # link-node incidence matrix
+        else:
+            I = np.zeros((L, N),dtype=complex)  # link-node incidence matrix
+            I[n,F] = -Y
+            I[n,T] = Y
         
         I =  I if complex_flows else I.real
         self.results[cachename] = I
@@ -714,26 +2246,120 @@ class Model:
         return self.results[cachename]
     
 
-    def graphSpectral(self,refresh:bool=False) -> tuple[float]:
+    def graphSpectral(self,refresh:bool=False,count:int=None) -> tuple[float]:
         """Get spectral analysis results
 
         Arguments:
         * refresh: force recalculation of previous results
+        * count: number of smallest eigenvalues to compute (None for all)
 
         Returns:
         * tuple: (E,U,K) where E is the eigenvalues, U is the eigenvectors,
           and K is the number of networks found
+
+        When `count` is given, a sparse partial eigensolver is used, so K
+        is at most `count`. Use `graphIslands()` to count networks.
         """
         self.assert_module("pypower")
-        if "graphSpectral" in self.results and not refresh:
-            return self.results["graphSpectral"]
-        G = self.graphLaplacian(refresh)
-        e,u = la.eig(G)
+        cachename = "graphSpectral" if count is None else f"graphSpectral.{count}"
+        if cachename in self.results and not refresh:
+            return self.results[cachename]
+        if count is None:
+            G = self.graphLaplacian(refresh)
+            e,u = la.eig(G)
+        else:
+            G = self.graphLaplacian(refresh,sparse=True)
+            e,u = sla.eigs(G.tocsc(),k=min(count,G.shape[0]-2),sigma=-1e-3,which='LM')
         i = e.argsort()
         E,U = np.abs(e[i].round(6)),u.T[i]
         K = sum([1 if x==0 else 0 for x in E])
-        self.results["graphSpectral"] = (E,U,K)
-        return self.results["graphSpectral"]
+        self.results[cachename] = (E,U,K)
+        return self.results[cachename]
+
+    def graphIslands(self,refresh:bool=False) -> tuple[int,np.array]:
+        """Get connected networks
+
+        Arguments:
+        * refresh: force recalculation of previous results
+
+        Returns:
+        * tuple: (K,L) where K is the number of networks found and L is the
+          network label of each bus
+        """
+        self.assert_module("pypower")
+        if "graphIslands" in self.results and not refresh:
+            return self.results["graphIslands"]
+        N = len(self.nodes(refresh))
+        F = self.bus_index(self.column("branch","fbus",refresh),refresh)
+        T = self.bus_index(self.column("branch","tbus"))
+        A = sp.csr_matrix((np.ones(len(F)),(F,T)),shape=(N,N))
+        self.results["graphIslands"] = csgraph.connected_components(A,directed=False)
+        return self.results["graphIslands"]
+
+    def island_models(self,refresh:bool=False) -> list[tuple]:
+        """Split the model into one model per network
+
+        Arguments:
+        * refresh: force recalculation of previous results
+
+        Returns:
+        * list: (busses,branches,ref,model) for each network, where `busses`
+          and `branches` are the bus and branch indexes of the network in
+          this model, `ref` is the index of the network reference bus in
+          the network model, and `model` is the network model
+
+        Busses, branches, and generators are renumbered in each network
+        model. Other objects are included in the network of their parent,
+        and objects without one are omitted. The reference bus is the first
+        REF bus in the network, or else the bus with the most generation
+        capacity, or else the first bus.
+        """
+        K,labels = self.graphIslands(refresh)
+        busses = [np.where(labels==k)[0] for k in range(K)]
+        renumber = np.zeros(len(labels),dtype=int)
+        for n in busses:
+            renumber[n] = np.arange(len(n))
+
+        # assign objects to networks
+        lines = labels[self.bus_index(self.column("branch","fbus",refresh),refresh)]
+        island = dict(zip(self.column("bus","name"),labels.tolist()))
+        island.update(zip(self.column("branch","name"),lines.tolist()))
+        island.update(zip(self.column("gen","name"),labels[self.bus_index(self.column("gen","bus"))].tolist()))
+        pending = {x:y["parent"] for x,y in self.data["objects"].items() if x not in island and y.get("parent")}
+        while pending:
+            found = {x:island[y] for x,y in pending.items() if y in island}
+            if not found:
+                break
+            island.update(found)
+            pending = {x:y for x,y in pending.items() if x not in found}
+
+        # build network data
+        objects = [{} for k in range(K)]
+        for name,data in self.data["objects"].items():
+            if name not in island:
+                continue
+            if data["class"] == "bus":
+                data = dict(data,bus_i=str(renumber[self.bus_index(int(data["bus_i"]))]+1))
+            elif data["class"] == "branch":
+                data = dict(data,
+                    fbus=str(renumber[self.bus_index(int(data["fbus"]))]+1),
+                    tbus=str(renumber[self.bus_index(int(data["tbus"]))]+1))
+            elif data["class"] == "gen":
+                data = dict(data,bus=str(renumber[self.bus_index(int(data["bus"]))]+1))
+            objects[island[name]][name] = data
+
+        types = self.column("bus","type",refresh)
+        capacity = self.generation("capacity",refresh).real
+        result = []
+        for k in range(K):
+            ref = np.where(types[busses[k]] == "REF")[0]
+            ref = int(ref[0]) if len(ref) > 0 else int(capacity[busses[k]].argmax())
+            data = dict(self.data,objects=objects[k])
+            data["globals"] = dict(data["globals"])
+            data["globals"]["modelname"] = dict(data["globals"]["modelname"],value=f"{self.name}:{k}")
+            model = Model(data,validate=[])
+            result.append((busses[k],np.where(lines == k)[0],ref,model))
+        return result
 
     def demand(self,kind:str='actual',refresh:bool=False) -> np.array:
         """Get demand array
@@ -748,9 +2374,9 @@ class Model:
         if f"demand.{kind}" in self.results and not refresh:
             return self.results[f"demand.{kind}" ]
         if kind == "actual":
-            self.results[f"demand.{kind}" ] = np.array([complex(self.get_property(x,"Pd"),self.get_property(x,"Qd")) for x in self.nodes(refresh)]) / self.perunit("S")
+            self.results[f"demand.{kind}" ] = (self.column("bus","Pd",refresh)+self.column("bus","Qd")*1j) / self.perunit("S",refresh)
         elif kind == "peak":
-            self.results[f"demand.{kind}" ] = np.array([complex(self.get_property(x,"Pd"),self.get_property(x,"Qd")) for x in self.nodes(refresh)]) / self.perunit("S")
+            self.results[f"demand.{kind}" ] = (self.column("bus","Pd",refresh)+self.column("bus","Qd")*1j) / self.perunit("S",refresh)
         else:
             raise ValueError(f"kind '{kind}' is invalid")
         return self.results[f"demand.{kind}" ]
@@ -772,14 +2398,13 @@ class Model:
             pass
         puS = self.perunit("S",refresh)
         if kind == 'capacity':
-            gen = [(self.get_property(x,"bus"),complex(self.get_property(x,"Pmax")/puS,self.get_property(x,"Qmax")/puS)) for x in self.generators(refresh)]
+            gen = self.column("gen","Pmax",refresh)/puS + self.column("gen","Qmax")/puS*1j
         elif kind == 'actual':
-            gen = [(self.get_property(x,"bus"),complex(self.get_property(x,"Pg")/puS,self.get_property(x,"Qg")/puS)) for x in self.generators(refresh)]
+            gen = self.column("gen","Pg",refresh)/puS + self.column("gen","Qg")/puS*1j
         else:
             raise ValueError(f"kind '{kind}' is invalid")
         result = np.zeros(len(self.nodes(refresh)),dtype=complex)
-        for bus,value in gen:
-            result[bus-1] += value
+        np.add.at(result,self.bus_index(self.column("gen","bus"),refresh),gen)
         return self.set_result(f"generators.{kind}",result)
 
     def prices(self,refresh:bool=False) -> np.array:
@@ -795,8 +2420,11 @@ class Model:
             if not refresh:
                 return self.results["prices"]
         #costs = {self.get_property(y["parent"],"bus"):float(y["costs"].split(",")[1]) for x,y in self.costs(refresh).items()} #TODO: check after testing - 
-        costs = {self.get_property(y["parent"],"bus"):float(y["costs"].split(",")[0]) for x,y in self.costs(refresh).items()}
-        self.results[f"prices"] = np.array([costs[n+1] if n+1 in costs else 0 for n in range(len(self.nodes(refresh)))])
+        gens = dict(zip(self.column("gen","name",refresh),self.column("gen","bus").tolist()))
+        costs = {gens[x]:float(y.split(",")[0]) for x,y in zip(self.column("gencost","parent",refresh),self.column("gencost","costs"))}
+        result = np.zeros(len(self.nodes(refresh)))
+        result[self.bus_index(list(costs),refresh)] = list(costs.values())
+        self.results[f"prices"] = result
         return self.results[f"prices"]
 
     def shunts(self,refresh:bool=False) -> dict:
@@ -813,7 +2441,9 @@ class Model:
                 return self.get_result(f"shunts")
         except:
             pass
-        result = {y["parent"]:{'setting':self.get_property(x,"admittance"),'capacity':self.get_property(x,"admittance_1")*self.get_property(x,"steps_1")} for x,y in self.find("shunt").items()}
+        setting = self.column("shunt","admittance",refresh).tolist()
+        capacity = (self.column("shunt","admittance_1")*self.column("shunt","steps_1")).tolist()
+        result = {x:{'setting':y,'capacity':z} for x,y,z in zip(self.column("shunt","parent"),setting,capacity)}
         return self.set_result(f"shunts",result)
 
     def capacitors(self,kind:str='installed',refresh:bool=False, verbose = False ) -> np.array:
@@ -836,14 +2466,12 @@ class Model:
         shunts = self.shunts(refresh)
 
         if kind == 'installed':
-            cap = [(self.get_property(x,"bus_i"),shunts[x]["capacity"]/puS if x in shunts else 0.0) for x in self.nodes(refresh)]
+            cap = [shunts[x]["capacity"]/puS if x in shunts else 0.0 for x in self.nodes(refresh)]
         elif kind == 'setting':
-            cap = [(self.get_property(x,"bus_i"),shunts[x]["setting"]/puS if x in shunts else 0.0) for x in self.nodes(refresh)]
+            cap = [shunts[x]["setting"]/puS if x in shunts else 0.0 for x in self.nodes(refresh)]
         else:
             raise ValueError(f"kind '{kind}' is invalid")
-        result = np.zeros(len(self.nodes(refresh)))
-        for bus,value in cap:
-            result[bus-1] += value
+        result = np.array(cap,dtype=float)
         return self.set_result(f"capacitors.{kind}",result)
 
     def condensers(self, kind: str = "installed", refresh: bool = False) -> np.ndarray:
@@ -866,15 +2494,13 @@ class Model:
         shunts = self.shunts(refresh)  # dict keyed by node
         result = np.zeros(N)
 
-        for node in self.nodes(refresh):
+        for bus, node in enumerate(self.nodes(refresh)):
             rec = shunts.get(node)
             if not rec:
                 continue
             if str(rec.get("type", "")).lower() != "condenser":
                 continue
 
-            bus = self.get_property(node, "bus_i")
-
             if kind == "installed":
                 val_mvar = float(rec.get("capacity", 0.0))  # ≥ 0 expected
             elif kind == "setting":
@@ -882,7 +2508,7 @@ class Model:
             else:
                 raise ValueError(f"kind '{kind}' is invalid (use 'installed' or 'setting')")
 
-            result[bus - 1] += val_mvar / puS  # bus_i assumed 1-based
+            result[bus] += val_mvar / puS
 
         return self.set_result(f"condensers.{kind}", result)
     
@@ -900,7 +2526,7 @@ class Model:
             return self.results[f"lineratings.{rating}"]
         if rating not in "ABC":
             return ValueError(f"line rating '{rating}' is invalid'")
-        self.results[f"lineratings.{rating}"] = np.array([self.get_property(x,f"rate{rating}") for x in self.lines()])/self.perunit('S',refresh) 
+        self.results[f"lineratings.{rating}"] = self.column("branch",f"rate{rating}",refresh)/self.perunit('S',refresh)
         return self.results[f"lineratings.{rating}"]
 
     def lineflow(self,refresh:bool=False, complex_flows:bool=True) -> np.array:
@@ -913,7 +2539,7 @@ class Model:
         * np.array: line flows pu.MVA
         """
         I = self.graphIncidence(refresh=refresh,complex_flows = complex_flows,weighted=True)
-        x = [self.get_property(x,'Va') for x in self.find('bus')]
+        x = self.column("bus","Va")
         return I@x
 
     def linevoltage(self,part:str='Va',refresh:bool=False) -> np.array:
@@ -927,7 +2553,7 @@ class Model:
         * np.array: line voltage angle/magnitude differences
         """
         I = self.graphIncidence(refresh=refresh,weighted=False)
-        x = [self.get_property(x,part) for x in self.find('bus')]
+        x = self.column("bus",part)
         return I@x
 
     def linesplit(self,angle_limit:float=10.0,update_model=False) -> dict:
@@ -943,7 +2569,7 @@ class Model:
 
         # compute voltage angle differences
         I = self.graphIncidence(weighted=False)
-        x = [self.get_property(x,'Va') for x in self.find('bus')]
+        x = self.column("bus","Va")
         Va = I@x
 
         # identify large angles
@@ -988,90 +2614,306 @@ class Model:
         """
         # print(f"\n*** {self.name} ***\n{new_gens=}\n{new_caps=}")
 
-        if verbose:
-            print("\nOSP results:",file=verbose)
-            print("-----------",file=verbose)
-
-        # add generators
-        if verbose:
-            print("\nNew generation:",file=verbose)
-            print(f"  Node{' '*(max([len(x) for x in self.find('bus',list)])-4)}    Bus       Pg       Qg      Pmax     Qmax     Qmin  ",file=verbose,)
-            print(f"  {'-'*(max([len(x) for x in self.find('bus',list)]))} -------- -------- -------- -------- -------- --------",file=verbose)
-        for bus,spec in {self.get_name("bus",n):(n,x) for n,x in enumerate(new_gens) if abs(x)>0}.items():
+        # new generators
+        names = self.get_name("bus")
+        gens = {}
+        objects = {}
+        for bus,spec in {names[n]:(n,x) for n,x in enumerate(new_gens) if abs(x)>0}.items():
             gen = f"G_{guid()}"
-            n = int(self.data['objects'][bus]['bus_i'])-1
-            obj = self.add_object("gen",gen,
-                parent=bus,
-                bus=str(self.data['objects'][bus]['bus_i']),
-                Pg = spec[1].real,
-                Qg = spec[1].imag,
-                Pmax=spec[1].real,
-                Qmax=max(spec[1].imag,spec[1].real*min_power_ratio[n]),
-                Qmin=-max(spec[1].imag,spec[1].real*min_power_ratio[n]),
-                Vg=self.get_property(bus,"Vm"),
-                status="IN_SERVICE",
-                )
-            # print("New gen:",gen,self.data["objects"][gen])
-            if verbose:
-                print(' ',' '.join([self.format(self.get_property(gen,x)) for x in ['parent','bus','Pg','Qg','Pmax','Qmax','Qmin']]),file=verbose)
+            n = spec[0]
+            objects[gen] = {
+                "class": "gen",
+                "parent": bus,
+                "bus": str(self.data['objects'][bus]['bus_i']),
+                "Pg": spec[1].real,
+                "Qg": spec[1].imag,
+                "Pmax": spec[1].real,
+                "Qmax": max(spec[1].imag,spec[1].real*min_power_ratio[n]),
+                "Qmin": -max(spec[1].imag,spec[1].real*min_power_ratio[n]),
+                "Vg": self.get_property(bus,"Vm"),
+                "status": "IN_SERVICE",
+                }
+            gens[gen] = bus
             gencost = f"GC_{guid()}"
-            self.add_object("gencost",gencost,
-                parent=gen,
-                model="POLYNOMIAL",
-                costs="0.01,100,0", # TODO: where to get this data from (maybe from the lowest cost unit already present if any)
-                )
-            # print("New gencost:",gencost,self.data["objects"][gencost])
-        
-        # add capacitors
-        if verbose:
-            print("\nNew capacitors:",file=verbose)
-            print(f"  Node{' '*(max([len(x) for x in self.find('bus',list)])-4)}   Vhigh    Vlow      Y       Steps    Yc",file=verbose,)
-            print(f"  {'-'*(max([len(x) for x in self.find('bus',list)]))} -------- -------- -------- -------- --------",file=verbose)
-        for bus,spec in {self.get_name("bus",n):(n,x) for n,x in enumerate(new_caps) if x>0}.items():
+            objects[gencost] = {
+                "class": "gencost",
+                "parent": gen,
+                "model": "POLYNOMIAL",
+                "costs": "0.01,100,0", # TODO: where to get this data from (maybe from the lowest cost unit already present if any)
+                }
+
+        # new capacitors
+        caps = {}
+        for bus,spec in {names[n]:(n,x) for n,x in enumerate(new_caps) if x>0}.items():
             shunt = f"S_{guid()}"
-            self.add_object("shunt",shunt,
-                parent=bus,
-                voltage_high=voltage_high,
-                voltage_low=voltage_low,
-                admittance=spec[1],
-                steps_1=10,
-                admittance_1=spec[1]/10,
-                )
-            
+            objects[shunt] = {
+                "class": "shunt",
+                "parent": bus,
+                "voltage_high": voltage_high,
+                "voltage_low": voltage_low,
+                "admittance": spec[1],
+                "steps_1": 10,
+                "admittance_1": spec[1]/10,
+                }
+            caps[shunt] = (bus,spec)
+
+        # new condensers
+        cons = {}
+        for bus,spec in {names[n]:(n,x) for n,x in enumerate(new_caps) if x<0}.items():
+            shunt = f"S_{guid()}"
+            objects[shunt] = {
+                "class": "shunt",
+                "parent": bus,
+                "voltage_high": voltage_high,
+                "voltage_low": voltage_low,
+                "admittance": spec[1],
+                "steps_1": 0,
+                "admittance_1": spec[1]
+                }
+            cons[shunt] = (bus,spec)
+
+        # update model
+        self.add_objects(objects)
+        for shunt,(bus,spec) in (caps|cons).items():
             #TODO: Test this and then remove
             self.set_property(bus,Bs=self.get_property(bus,"Bs")+spec[1])
             #self.set_property(bus,Qd=self.get_property(bus,"Qd")+spec[1])
-            # print("New shunt:",shunt,self.data["objects"][shunt])
-            if verbose:
-                print(' ',' '.join([self.format(self.get_property(shunt,x)) for x in ['parent','voltage_high','voltage_low','admittance','steps_1','admittance_1']]),file=verbose)
 
-        # add condensers
-        if verbose:
-            print("\nNew condensers:",file=verbose)
-            print(f"  Node{' '*(max([len(x) for x in self.find('bus',list)])-4)}   Vhigh    Vlow      Y       Steps    Yc",file=verbose,)
-            print(f"  {'-'*(max([len(x) for x in self.find('bus',list)]))} -------- -------- -------- -------- --------",file=verbose)
-        
-        for bus,spec in {self.get_name("bus",n):(n,x) for n,x in enumerate(new_caps) if x<0}.items():
-            shunt = f"S_{guid()}"
-            self.add_object("shunt",shunt,
-                parent=bus,
-                voltage_high=voltage_high,
-                voltage_low=voltage_low,
-                admittance=spec[1],
-                steps_1=0,
-                admittance_1=spec[1]
-                )
-            
-            #TODO: Remove 
-            self.set_property(bus,Bs=self.get_property(bus,"Bs")+spec[1])
-            #self.set_property(bus,Qd=self.get_property(bus,"Qd")+spec[1])
-            # print("New shunt:",shunt,self.data["objects"][shunt])
-            if verbose:
-                print(' ',' '.join([self.format(self.get_property(shunt,x)) for x in ['parent','voltage_high','voltage_low','admittance','steps_1','admittance_1']]),file=verbose)
+        if not verbose:
+            return
+
+        print("\nOSP results:",file=verbose)
+        print("-----------",file=verbose)
+        width = max([len(x) for x in self.find('bus',list)])
+
+        print("\nNew generation:",file=verbose)
+        print(f"  Node{' '*(width-4)}    Bus       Pg       Qg      Pmax     Qmax     Qmin  ",file=verbose,)
+        print(f"  {'-'*width} -------- -------- -------- -------- -------- --------",file=verbose)
+        for gen in gens:
+            print(' ',' '.join([self.format(self.get_property(gen,x)) for x in ['parent','bus','Pg','Qg','Pmax','Qmax','Qmin']]),file=verbose)
+
+        print("\nNew capacitors:",file=verbose)
+        print(f"  Node{' '*(width-4)}   Vhigh    Vlow      Y       Steps    Yc",file=verbose,)
+        print(f"  {'-'*width} -------- -------- -------- -------- --------",file=verbose)
+        for shunt in caps:
+            print(' ',' '.join([self.format(self.get_property(shunt,x)) for x in ['parent','voltage_high','voltage_low','admittance','steps_1','admittance_1']]),file=verbose)
+
+        print("\nNew condensers:",file=verbose)
+        print(f"  Node{' '*(width-4)}   Vhigh    Vlow      Y       Steps    Yc",file=verbose,)
+        print(f"  {'-'*width} -------- -------- -------- -------- --------",file=verbose)
+        for shunt in cons:
+            print(' ',' '.join([self.format(self.get_property(shunt,x)) for x in ['parent','voltage_high','voltage_low','admittance','steps_1','admittance_1']]),file=verbose)
 
     #
     # Optimizations
     #
+    @staticmethod
+    def _bus_values(value:float|list|dict,N:int,default:np.array) -> np.array:
+        """Normalize a per-bus argument
+
+        Arguments:
+        * value: None, a value for all busses, a list, or a dict by bus index
+        * N: number of busses
+        * default: values used for None and busses missing from a dict
+
+        Returns:
+        * np.array: per-bus values
+        """
+        if value is None:
+            return default
+        elif isinstance(value,float) or isinstance(value,int):
+            return np.full(N,value)
+        elif isinstance(value,dict):
+            return np.array([value[n] if n in value else default[n] for n in range(N)])
+        elif isinstance(value,list):
+            return np.array(value)
+        return value
+
+    @property
+    def problem(self) -> tuple:
+        """Solver data for the last problem solved
+
+        The data is only generated when it is first requested after a solve,
+        see `cvxpy.Problem.get_problem_data()`.
+
+        Returns:
+        * tuple: solver data, solving chain, and inverse data (None if no problem was solved)
+        """
+        if self._solved is None:
+            return None
+        if "data" not in self._solved:
+            self._solved["data"] = self._solved["problem"].get_problem_data(solver=self._solved["solver"])
+        return self._solved["data"]
+
+    def export_problem(self,file:str|TypeVar('io.TextIOWrapper'),format:str=None):
+        """Export the last problem solved
+
+        Arguments:
+        * file: output filename or stream
+        * format: 'cbf', 'mps', or 'lp' (default from file extension)
+
+        The solver data is written in the conic form `minimize c'x subject to
+        b-Ax in K`, where K is a product of zero, nonnegative, and second-order
+        cones, so the problem must have been solved by a conic solver. The
+        problem is only available after a solve, not when the solution is
+        found in the cache. The CBF output is the conic benchmark format. The MPS output is
+        free MPS with second-order cones in CSECTION blocks and the LP output is
+        CPLEX LP with second-order cones as quadratic constraints. Cone rows
+        use slack variables `s#` and problem variables are named `x#`.
+        """
+        if format is None:
+            if not isinstance(file,str):
+                raise ValueError("format must be specified for streams")
+            format = os.path.splitext(file)[1][1:]
+        writers = {"cbf":self._write_cbf,"mps":self._write_mps,"lp":self._write_lp}
+        if format.lower() not in writers:
+            raise ValueError(f"format '{format}' is not supported (use {', '.join(writers)})")
+        if self.problem is None:
+            raise ModelError(f"{self.name} has no problem solved to export")
+        data = self.problem[0]
+        if "P" in data and data["P"] is not None and data["P"].nnz > 0:
+            raise ValueError("quadratic objectives cannot be exported")
+        dims = data["dims"]
+        if dims.exp or dims.psd or dims.p3d or dims.pnd:
+            raise ValueError("only zero, nonnegative, and second-order cones can be exported")
+        if data.get("G") is not None or data.get("lower_bounds") is not None or data.get("upper_bounds") is not None \
+                or data["A"].shape[0] != dims.zero+dims.nonneg+sum(dims.soc):
+            raise ValueError(f"solver '{self._solved['solver']}' data is not in conic form (use a conic solver, e.g., CLARABEL or SCS)")
+        if isinstance(file,str):
+            with open(file,"w") as fh:
+                writers[format.lower()](data,fh)
+        else:
+            writers[format.lower()](data,file)
+
+    @staticmethod
+    def _cone_rows(data:dict) -> tuple:
+        """Get the cone rows of conic solver data
+
+        Returns:
+        * tuple: number of zero rows, number of nonnegative rows, and list of second-order cone row ranges
+        """
+        dims = data["dims"]
+        cones = []
+        start = dims.zero + dims.nonneg
+        for size in dims.soc:
+            cones.append(range(start,start+size))
+            start += size
+        return dims.zero,dims.nonneg,cones
+
+    @staticmethod
+    def _terms(row,names) -> str:
+        """Format the linear terms of a sparse row"""
+        return " ".join(f"{'-' if x < 0 else '+'} {abs(x):.17g} {names[j]}" for j,x in zip(row.indices,row.data)) or "0 x0"
+
+    def _write_cbf(self,data:dict,fh:TypeVar('io.TextIOWrapper')):
+        """Write conic solver data in CBF format"""
+        A = sp.coo_array(data["A"])
+        c = data["c"]
+        b = data["b"]
+        zero,nonneg,cones = self._cone_rows(data)
+        m,n = A.shape
+        print("VER","3","","OBJSENSE","MIN","","VAR",f"{n} 1",f"F {n}","",sep="\n",file=fh)
+        blocks = [x for x in [("L=",zero),("L+",nonneg)] if x[1]] + [("Q",len(x)) for x in cones]
+        print("CON",f"{m} {len(blocks)}",*[f"{x} {y}" for x,y in blocks],"",sep="\n",file=fh)
+        print("OBJACOORD",np.count_nonzero(c),*[f"{j} {x:.17g}" for j,x in enumerate(c) if x],"",sep="\n",file=fh)
+        print("ACOORD",A.nnz,*[f"{i} {j} {-x:.17g}" for i,j,x in zip(A.row,A.col,A.data)],"",sep="\n",file=fh)
+        print("BCOORD",np.count_nonzero(b),*[f"{i} {x:.17g}" for i,x in enumerate(b) if x],sep="\n",file=fh)
+
+    def _write_mps(self,data:dict,fh:TypeVar('io.TextIOWrapper')):
+        """Write conic solver data in free MPS format"""
+        A = sp.csc_array(data["A"])
+        c = data["c"]
+        b = data["b"]
+        zero,nonneg,cones = self._cone_rows(data)
+        m,n = A.shape
+        rows = [f"r{i}" for i in range(m)]
+        kinds = ["E"]*zero + ["L"]*nonneg + ["E"]*(m-zero-nonneg)
+        print(f"NAME {self.name}","ROWS"," N obj",*[f" {x} {y}" for x,y in zip(kinds,rows)],"COLUMNS",sep="\n",file=fh)
+        for j in range(n):
+            if c[j]:
+                print(f" x{j} obj {c[j]:.17g}",file=fh)
+            for i,x in zip(A.indices[A.indptr[j]:A.indptr[j+1]],A.data[A.indptr[j]:A.indptr[j+1]]):
+                print(f" x{j} {rows[i]} {x:.17g}",file=fh)
+        for i in range(zero+nonneg,m):
+            print(f" s{i} {rows[i]} 1",file=fh)
+        print("RHS",*[f" rhs {rows[i]} {x:.17g}" for i,x in enumerate(b) if x],sep="\n",file=fh)
+        print("BOUNDS",*[f" FR bnd x{j}" for j in range(n)],*[f" FR bnd s{i}" for i in range(zero+nonneg,m)],sep="\n",file=fh)
+        for k,cone in enumerate(cones):
+            print(f"CSECTION q{k} 0 QUAD",*[f" s{i}" for i in cone],sep="\n",file=fh)
+        print("ENDATA",file=fh)
+
+    def _write_lp(self,data:dict,fh:TypeVar('io.TextIOWrapper')):
+        """Write conic solver data in CPLEX LP format"""
+        A = sp.csr_array(data["A"])
+        c = sp.csr_array(data["c"].reshape(1,-1))
+        b = data["b"]
+        zero,nonneg,cones = self._cone_rows(data)
+        m,n = A.shape
+        names = [f"x{j}" for j in range(n)]
+        print(f"\\ {self.name}","Minimize",f" obj: {self._terms(c[[0]],names)}","Subject To",sep="\n",file=fh)
+        for i in range(m):
+            row = A[[i]]
+            if i < zero:
+                print(f" r{i}: {self._terms(row,names)} = {b[i]:.17g}",file=fh)
+            elif i < zero + nonneg:
+                print(f" r{i}: {self._terms(row,names)} <= {b[i]:.17g}",file=fh)
+            else:
+                print(f" r{i}: {self._terms(row,names)} + s{i} = {b[i]:.17g}",file=fh)
+        for k,cone in enumerate(cones):
+            print(f" q{k}: [ {' + '.join(f's{i} ^2' for i in cone[1:])} - s{cone[0]} ^2 ] <= 0",file=fh)
+        print("Bounds",*[f" {x} free" for x in names],sep="\n",file=fh)
+        for cone in cones:
+            print(f" s{cone[0]} >= 0",*[f" s{i} free" for i in cone[1:]],sep="\n",file=fh)
+        print("End",file=fh)
+
+    def _solve_islands(self,method:str,kwargs:dict,busdata:dict={},max_workers:int=None,ref:int|str=None) -> dict:
+        """Solve an optimization separately on each network
+
+        Arguments:
+        * method: 'optimal_powerflow' or 'optimal_sizing'
+        * kwargs: optimization arguments
+        * busdata: per-bus optimization arguments
+        * max_workers: number of worker processes (1 solves in this process)
+        * ref: reference bus index or object name (used in its own network only)
+
+        Returns:
+        * dict: network results combined by bus and branch index
+        """
+        if isinstance(ref,str):
+            ref = self.get_index("bus",self.get_bus(ref))
+        islands = self.island_models()
+        if not ref is None and not any(ref in busses for busses,_,_,_ in islands):
+            raise ValueError(f"reference bus {ref} is not in any network")
+        tasks = [(model.data,method,kwargs|{x:y[busses] for x,y in busdata.items()}
+                |{"ref":int(np.where(busses == ref)[0][0]) if ref in busses else island_ref})
+            for busses,branches,island_ref,model in islands]
+        if max_workers == 1:
+            results = [_solve_island(*x) for x in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers) as pool:
+                results = list(pool.map(_solve_island,*zip(*tasks)))
+
+        N = len(self.nodes())
+        L = len(self.lines())
+        result = {}
+        for (busses,branches,ref,model),data in zip(islands,results):
+            for key,value in data.items():
+                if key == "cost":
+                    result[key] = result.get(key,0) + value
+                elif key == "status":
+                    if result.get(key,"optimal") == "optimal":
+                        result[key] = value
+                elif key == "additions":
+                    for kind,items in value.items():
+                        result.setdefault(key,{}).setdefault(kind,{}).update({int(busses[n]):x for n,x in items.items()})
+                elif key == "flows":
+                    result.setdefault(key,np.zeros(L,dtype=value.dtype))[branches] = value
+                else:
+                    result.setdefault(key,np.zeros((N,)+value.shape[1:],dtype=value.dtype))[busses] = value
+        if "additions" in result:
+            result["additions"] = {x:dict(sorted(y.items())) for x,y in result["additions"].items()}
+        return result
+
     def _solver_failed(err):
         """Failed solution default handler"""
         raise RuntimeError(err)
@@ -1080,6 +2922,385 @@ class Model:
         """Invalid problem default handler"""
         raise ValueError(err)
 
+    @staticmethod
+    def _same(a,b) -> bool:
+        """Check whether two problem constants are identical"""
+        if a.shape != b.shape or sp.issparse(a) != sp.issparse(b):
+            return False
+        return (a != b).nnz == 0 if sp.issparse(a) else np.array_equal(a,b)
+
+    def _compiled_problem(self,name:str,key:tuple,constants:list,compile:callable) -> dict:
+        """Get a cached parameterized problem
+
+        Arguments:
+        * name: problem name
+        * key: problem structure options (e.g., reference bus)
+        * constants: problem constants (e.g., graph Laplacian)
+        * compile: problem constructor called with the constants
+
+        Returns:
+        * dict: problem, variables, and parameters
+
+        The problem is reused as long as the key and constants are unchanged,
+        so that solving it with new parameter values does not require cvxpy
+        to canonicalize the problem again.
+        """
+        cached = self._problems.get(name)
+        if cached is None or cached["key"] != key \
+                or not all(self._same(x,y) for x,y in zip(cached["constants"],constants)):
+            cached = self._problems[name] = {"key":key,"constants":constants} | compile(*constants)
+        return cached
+
+    def _solve(self,problem:TypeVar('cp.Problem'),variables:dict,warm_start:Union[bool,dict],**kwargs):
+        """Solve a problem from a previous solution when possible
+
+        Arguments:
+        * problem: problem to solve
+        * variables: problem variables by name
+        * warm_start: solution to start from, True for the last solution
+          found, or False for a cold start
+        * kwargs: solver options
+
+        Solvers that accept a starting point (e.g., Gurobi, MOSEK) start from
+        the variable values, which are set from the solution given, or else
+        from the last solution found by the model when the problem has not
+        been solved yet. Solvers that restart from their own previous iterates
+        (e.g., SCS, OSQP) do so when the same compiled problem is solved
+        again. Other solvers ignore the starting point. When a warm start
+        fails the problem is solved again from a cold start.
+        """
+        if warm_start is False:
+            return problem.solve(warm_start=False,**kwargs)
+        start = self._last_solution if warm_start is True else warm_start
+        if isinstance(start,dict) and (warm_start is not True or any(x.value is None for x in variables.values())):
+            puS = self.perunit("S")
+            values = {}
+            if "angle" in start:
+                values["x"] = np.asarray(start["angle"])/57.3
+            if "magnitude" in start:
+                values["y"] = np.asarray(start["magnitude"])
+            if "generation" in start:
+                values["g"] = np.asarray(start["generation"]).real/puS
+                values["h"] = np.asarray(start["generation"]).imag/puS
+            if "capacitors" in start and "condensers" in start:
+                values["c"] = (np.asarray(start["capacitors"])-np.asarray(start["condensers"]))/puS
+            if "curtailment" in start:
+                values["d"] = np.asarray(start["curtailment"]).real/puS
+            for name,value in values.items():
+                if name in variables and value.shape == variables[name].shape:
+                    variables[name].value = value.astype(float)
+        try:
+            return problem.solve(warm_start=True,**kwargs)
+        except cp.SolverError:
+            return problem.solve(warm_start=False,**kwargs)
+
+    @staticmethod
+    def _powerflow_problem(G,I,ref:int) -> dict:
+        """Construct the parameterized optimal powerflow problem
+
+        Arguments:
+        * G: graph Laplacian
+        * I: graph incidence
+        * ref: reference bus index
+
+        Returns:
+        * dict: problem, variables, and parameters
+        """
+        N = G.shape[0]
+        L = I.shape[0]
+
+        # setup variables
+        x = cp.Variable(N)  # nodal voltage angles
+        y = cp.Variable(N)  # nodal voltage magnitudes
+        g = cp.Variable(N)  # generation real power dispatch
+        h = cp.Variable(N)  # generation reactive power dispatch
+        c = cp.Variable(N)  # capacitor bank settings
+        d = cp.Variable(N)  # demand real power curtailment
+        e = cp.Variable(N)  # demand reactive power curtailment
+        #TODO: checking if adding synchronous condensor settins work 
+        r = cp.Variable(N)
+
+        # setup parameters
+        P = cp.Parameter(N,nonneg=True,name="prices")
+        Q = cp.Parameter(N,nonneg=True,name="curtailment_price")
+        Dr = cp.Parameter(N,name="demand_real")
+        Di = cp.Parameter(N,name="demand_reactive")
+        Dm = cp.Parameter(N,nonneg=True,name="demand_magnitude")
+        Sr = cp.Parameter(N,name="generation_real")
+        Si = cp.Parameter(N,name="generation_reactive")
+        C = cp.Parameter(N,name="capacitors")
+        R = cp.Parameter(N,nonneg=True,name="condensers")
+        F = cp.Parameter(L,name="lineratings") if L > 0 else None
+        V = cp.Parameter(nonneg=True,name="voltage_limit")
+
+        cost = P @ ( cp.abs(g + h * 1j))
+        shed = Q @ cp.abs(d+e*1j)
+        objective = cp.Minimize(cost + shed)  # minimum cost (generation + demand response)
+        constraints = [
+            #NOTE: original constraint
+            G.real @ x - g + c + Dr - d - r == 0,  # KCL/KVL real power laws
+            G.imag @ y - h - c + Di - e + r == 0,  # KCL/KVL reactive power laws
+            x[ref] == 0,  # swing bus voltage angle always 0
+            y[ref] == 1,  # swing bus voltage magnitude is always 1
+            cp.abs(y - 1) <= V,  # limit voltage magnitude to 5% deviation
+            g >= 0,  # generation real power limits
+            cp.abs(h) <= Si,  # generation reactive power limits
+            cp.abs(g+h*1j) <= Sr, # generation apparent power limit
+            0 <= c, c <= C, # capacitor bank settings
+            r <= R, 
+            d >= 0, cp.abs(d+e*1j) <= Dm,  # demand curtailment constraint with flexible reactive power
+            ]
+        if L > 0:
+            constraints.append(cp.abs(I.real@x + I.imag@y) <= F)  # line flow limits
+        return {
+            "problem": cp.Problem(objective, constraints),
+            "variables": {"x":x,"y":y,"g":g,"h":h,"c":c,"d":d,"e":e,"r":r},
+            "parameters": {x.name():x for x in [P,Q,Dr,Di,Dm,Sr,Si,C,R,F,V] if x is not None},
+            }
+
+    @staticmethod
+    def _multiperiod_problem(G,I,ref:int,values:dict) -> dict:
+        """Construct the stacked multi-period optimal powerflow problem
+
+        Arguments:
+        * G: graph Laplacian
+        * I: graph incidence
+        * ref: reference bus index
+        * values: (N,K) arrays of the `_powerflow_problem()` parameters for
+          K periods, by parameter name
+
+        Returns:
+        * dict: problem and variables
+
+        The problem stacks the optimal powerflow problems of the periods, with
+        one column of each variable per period. The values are constants
+        rather than parameters because the size of the parameterized problem
+        data grows with the square of the number of periods.
+        """
+        N,K = values["demand_real"].shape
+        L = I.shape[0]
+
+        # setup variables
+        x = cp.Variable((N,K))  # nodal voltage angles
+        y = cp.Variable((N,K))  # nodal voltage magnitudes
+        g = cp.Variable((N,K))  # generation real power dispatch
+        h = cp.Variable((N,K))  # generation reactive power dispatch
+        c = cp.Variable((N,K))  # capacitor bank settings
+        d = cp.Variable((N,K))  # demand real power curtailment
+        e = cp.Variable((N,K))  # demand reactive power curtailment
+        r = cp.Variable((N,K))  # condenser settings
+
+        cost = cp.sum(cp.multiply(values["prices"],cp.abs(g + h * 1j)))
+        shed = cp.sum(cp.multiply(values["curtailment_price"],cp.abs(d + e * 1j)))
+        objective = cp.Minimize(cost + shed)  # minimum cost (generation + demand response)
+        constraints = [
+            G.real @ x - g + c + values["demand_real"] - d - r == 0,  # KCL/KVL real power laws
+            G.imag @ y - h - c + values["demand_reactive"] - e + r == 0,  # KCL/KVL reactive power laws
+            x[ref,:] == 0,  # swing bus voltage angle always 0
+            y[ref,:] == 1,  # swing bus voltage magnitude is always 1
+            cp.abs(y - 1) <= values["voltage_limit"],  # limit voltage magnitude deviation
+            g >= 0,  # generation real power limits
+            cp.abs(h) <= values["generation_reactive"],  # generation reactive power limits
+            cp.abs(g+h*1j) <= values["generation_real"], # generation apparent power limit
+            0 <= c, c <= values["capacitors"], # capacitor bank settings
+            r <= values["condensers"],
+            d >= 0, cp.abs(d+e*1j) <= values["demand_magnitude"],  # demand curtailment constraint with flexible reactive power
+            ]
+        if L > 0:
+            constraints.append(cp.abs(I.real@x + I.imag@y) <= values["lineratings"])  # line flow limits
+        return {
+            "problem": cp.Problem(objective, constraints),
+            "variables": {"x":x,"y":y,"g":g,"h":h,"c":c,"d":d,"e":e,"r":r},
+            }
+
+    @_refresh_pass
+    def multiperiod_powerflow(self,
+            demand:np.ndarray|dict,
+            times:list|np.ndarray=None,
+            chunksize:int=None,
+            refresh:bool=False,
+            curtailment_price:float=None,
+            ref:int|str=None,
+            voltage_limit:float=0.05,
+            complex_flows:bool=True,
+            sparse:bool=False,
+            on_invalid=_problem_invalid,
+            on_fail=_solver_failed,
+            **kwargs) -> dict:
+        """Solve the optimal powerflow problem over a demand time series
+
+        Arguments:
+        * demand: (T,N) array of bus demands (MW + MVAr j), or schedule names
+          by bus name whose values scale the bus demands
+        * times: times at which the schedules are evaluated (see `schedule()`)
+        * chunksize: number of periods solved together (None for all, 1 to
+          solve each period with the compiled `optimal_powerflow()` problem)
+        * refresh: force recalculation of all values
+        * curtailment_price: load shedding price (default is 100 times the maximum generator price)
+        * ref: reference bus index or object name
+        * voltage_limit: voltage magnitude violation limit
+        * complex_flows: if true creates a complex graph incidence matrix
+        * sparse: use sparse graph Laplacian and incidence matrices
+        * on_invalid: invalid problem handler
+        * on_fail: failed solution handler
+        * kwargs: arguments passed to solver
+
+        Returns:
+        * dict: "magnitude", "angle", "generation", "capacitors",
+          "condensers", "curtailment", and "demand" (T,N) arrays, "flows"
+          (T,L) array, and "cost" and "status" (T,) arrays
+
+        The periods of each chunk are solved together as one stacked problem
+        (see `_multiperiod_problem()`), so the problem is constructed and
+        solved once per chunk instead of once per period. Smaller chunks use
+        less memory. Periods are independent, i.e., there are no ramping or
+        storage constraints.
+        """
+        self._solved = None # cleared until a problem is solved
+        try:
+            islands = self.graphIslands()[0]
+            if islands != 1:
+                return on_invalid(f"{self.name} cannot optimize {islands} networks at a time")
+            if ref is None:
+                ref = self.select({"class":"bus","type":"REF"})
+                ref = self.get_index("bus",list(ref)[0]) if len(ref) > 0 else 0
+            elif isinstance(ref,str):
+                ref = self.get_index("bus",self.get_bus(ref))
+
+            P = self.prices(refresh)
+            G = self.graphLaplacian(refresh,sparse)
+            I = self.graphIncidence(refresh,complex_flows,sparse=sparse)
+            F = self.lineratings("A",refresh)
+            S = self.generation('capacity',refresh)
+            C = self.capacitors('installed',refresh)
+            R = self.condensers("installed",refresh)
+            N = len(self.nodes(refresh))
+            puS = self.perunit("S")
+            if isinstance(demand,dict):
+                if times is None:
+                    raise ValueError("times are required to evaluate demand schedules")
+                scale = np.ones((len(times),N))
+                for bus,name in demand.items():
+                    scale[:,self.get_index("bus",bus)] = self.schedule(name,times)
+                D = scale * self.demand('actual',refresh)
+            else:
+                D = np.asarray(demand,dtype=complex) / puS
+            if D.ndim != 2 or D.shape[1] != N or len(D) == 0:
+                raise ValueError(f"demand shape {D.shape} is not (T,{N})")
+        except Exception as err:
+            return on_invalid(err)
+
+        T = len(D)
+        if curtailment_price is None:
+            curtailment_price = 100*max(P)
+        result = {x:[] for x in ["magnitude","angle","generation","capacitors","condensers","curtailment","flows","cost","status"]}
+        try:
+            compiled = chunksize == 1 and self._compiled_problem("optimal_powerflow",(ref,complex_flows,sparse),[G,I],
+                lambda G,I: self._powerflow_problem(G,I,ref))
+            for start in range(0,T,chunksize or T):
+                chunk = D[start:start+(chunksize or T)].T
+                K = chunk.shape[1]
+                tile = lambda x: np.repeat(np.asarray(x,dtype=float).reshape(-1,1),K,axis=1)
+                values = {
+                    "prices": tile(P),
+                    "curtailment_price": np.full((N,K),float(curtailment_price)),
+                    "demand_real": chunk.real,
+                    "demand_reactive": chunk.imag,
+                    "demand_magnitude": np.abs(chunk),
+                    "generation_real": tile(S.real),
+                    "generation_reactive": tile(S.imag),
+                    "capacitors": tile(C),
+                    "condensers": tile(np.abs(R)),
+                    "lineratings": tile(F),
+                    "voltage_limit": voltage_limit,
+                    }
+                if compiled:
+                    opf = compiled
+                    for name,parameter in opf["parameters"].items():
+                        parameter.value = values[name] if name == "voltage_limit" else values[name][:,0]
+                else:
+                    opf = self._multiperiod_problem(G,I,ref,values)
+                problem = opf["problem"]
+                problem.solve(**kwargs)
+                if opf["variables"]["x"].value is None:
+                    return on_fail(problem.status)
+                x,y,g,h,c,d,e,r = [x.value.reshape(N,K) for x in opf["variables"].values()]
+                cost = P @ np.abs(g+h*1j) + curtailment_price*np.abs(d+e*1j).sum(axis=0)
+                result["magnitude"].append(y.T.round(3))
+                result["angle"].append((x.T*57.3).round(2))
+                result["generation"].append((g+h*1j).T.round(3)*puS)
+                result["capacitors"].append(np.maximum(c.T,0).round(3)*puS)
+                result["condensers"].append(np.maximum(-c.T,0).round(3)*puS)
+                result["curtailment"].append(d.T.round(3)*puS)
+                result["flows"].append(np.abs(I.real@x + I.imag@y).T.round(3)*puS)
+                result["cost"].append(cost.round(2))
+                result["status"].append(np.full(K,problem.status,dtype=object))
+            self._solved = {"problem":problem,"solver":kwargs.get("solver")}
+        except Exception as err:
+            return on_invalid(err)
+        result = {x:np.concatenate(y) for x,y in result.items()}
+        result["demand"] = D.round(3)*puS
+        return self.set_result("multiperiod_powerflow",result)
+
+    @staticmethod
+    def _sizing_problem(G,I,ref:int,expansion:bool) -> dict:
+        """Construct the parameterized optimal sizing/placement problem
+
+        Arguments:
+        * G: graph Laplacian
+        * I: graph incidence
+        * ref: reference bus index
+        * expansion: limit generation additions (see `generator_expansion_limit`)
+
+        Returns:
+        * dict: problem, variables, and parameters
+        """
+        N = G.shape[0]
+        L = I.shape[0]
+
+        # setup variables
+        x = cp.Variable(N)  # nodal voltage angles
+        y = cp.Variable(N)  # nodal voltage magnitudes
+        g = cp.Variable(N)  # generation real power dispatch
+        h = cp.Variable(N)  # generation reactive power dispatch
+        c = cp.Variable(N)  # capacitor bank settings
+
+        # setup parameters
+        Pg = cp.Parameter(N,nonneg=True,name="gen_cost_real")
+        Qg = cp.Parameter(N,nonneg=True,name="gen_cost_reactive")
+        Cm = cp.Parameter(N,nonneg=True,name="cap_cost_magnitude")
+        Cs = cp.Parameter(N,name="cap_cost_sign")
+        Dr = cp.Parameter(N,name="demand_real")
+        Di = cp.Parameter(N,name="demand_reactive")
+        V = cp.Parameter(nonneg=True,name="voltage_limit")
+        K = cp.Parameter(N,nonneg=True,name="reactive_power_constraint")
+        F = cp.Parameter(L,name="lineratings") if L > 0 else None
+        S = cp.Parameter(N,nonneg=True,name="generation_limit") if expansion else None
+
+        costs = Pg @ cp.abs(g) + Qg @ cp.abs(h) + Cm @ cp.abs(c) + Cs @ c
+        objective = cp.Minimize(costs)  # minimum cost (generation + demand response)
+        constraints = [
+            g - G.real @ x + c - Dr == 0,  # KCL/KVL real power laws
+            h - G.imag @ y - c - Di == 0,  # KCL/KVL reactive power laws
+            x[ref] == 0,  # swing bus voltage angle always 0
+            y[ref] == 1,  # swing bus voltage magnitude is always 1
+            cp.abs(y - 1) <= V,  # limit voltage magnitude to 5% deviation
+            g >= 0, # generation must be positive
+            cp.abs(h) <= cp.multiply(K,g), # limit how much reactive power a generator can produce
+            ]
+        if L > 0:
+            # line flow limits (isolated busses have no lines)
+            constraints.append(cp.abs(I @ x) <= F)
+        if expansion:
+            # limit where and how much generation can be added
+            constraints.append(cp.abs(g+h*1j) <= S)
+        return {
+            "problem": cp.Problem(objective, constraints),
+            "variables": {"x":x,"y":y,"g":g,"h":h,"c":c},
+            "parameters": {x.name():x for x in [Pg,Qg,Cm,Cs,Dr,Di,V,K,F,S] if x is not None},
+            }
+
+    @_refresh_pass
     def optimal_powerflow(self,
         refresh:bool=False,
         verbose:bool|TypeVar('io.TextIOWrapper')=False,
@@ -1088,6 +3309,10 @@ class Model:
         angle_limit:float=10.0,
         voltage_limit:float=0.05,
         complex_flows:bool = True, 
+        sparse:bool=False,
+        split_islands:bool=False,
+        max_workers:int=None,
+        warm_start:Union[bool,dict]=True,
         on_invalid:callable=_problem_invalid,
         on_fail:callable=_solver_failed,
         **kwargs) -> dict:
@@ -1097,9 +3322,14 @@ class Model:
         * refresh: force recalculation of previous result
         * verbose: output solver data and results
         * curtailment_price: price at which load is curtailed
-        * ref: reference bus id or name
+        * ref: reference bus index or object name
         * angle_limit: voltage angle accuracy limit
         * voltage_limit: voltage magnitude violation limit
+        * complex_flows: if true creates a complex graph incidence matrix
+        * sparse: use sparse graph Laplacian and incidence matrices
+        * split_islands: solve each network separately when there are several
+        * max_workers: number of processes used to solve networks (1 for none)
+        * warm_start: solution to start from, True for the last solution found, or False for a cold start (see `_solve()`)
         * on_invalid: invalid problem handler
         * on_fail: solution failed handler
         * kwargs: options passed of cvxpy.Problem.solve()
@@ -1107,16 +3337,44 @@ class Model:
         Returns:
         * dict: solution results
         """
-        try:
-            if not refresh and not self.modified:
-                return self.get_result("optimal_powerflow")
-        except:
-            pass
-
-        if self.graphSpectral()[2] > 1:
-            return on_invalid(f"{self.name} cannot solve OPF on more than one network at a time (model has {self.graphSpectral()[2]} networks)")
-        if self.graphSpectral()[2] == 0:
-            return on_invalid(f"{self.name} cannot solve OPF on invalid network modles (no zero eigenvalues found)")
+        self._solved = None # cleared until a problem is solved (not on cached or split solutions)
+        solution = self._solution_name("optimal_powerflow",{
+            "curtailment_price": curtailment_price,
+            "ref": ref,
+            "angle_limit": angle_limit,
+            "voltage_limit": voltage_limit,
+            "complex_flows": complex_flows,
+            "sparse": sparse,
+            "split_islands": split_islands,
+            }|kwargs,refresh)
+        if not refresh and solution in self.results:
+            return self.get_solution(solution)
+        result = None if refresh else self.load_solution(solution)
+        if result:
+            return self.set_solution("optimal_powerflow",solution,result)
+
+        islands = self.graphIslands()[0]
+        if islands > 1 and not split_islands:
+            return on_invalid(f"{self.name} cannot solve OPF on more than one network at a time (model has {islands} networks)")
+        if islands == 0:
+            return on_invalid(f"{self.name} cannot solve OPF on invalid network modles (no busses found)")
+        if islands > 1:
+            try:
+                if curtailment_price is None:
+                    curtailment_price = 100*max(self.prices(refresh)) # same default for all networks
+                result = self._solve_islands("optimal_powerflow",{
+                        "curtailment_price": curtailment_price,
+                        "angle_limit": angle_limit,
+                        "voltage_limit": voltage_limit,
+                        "complex_flows": complex_flows,
+                        "sparse": sparse,
+                        }|kwargs,
+                    max_workers=max_workers,ref=ref)
+            except RuntimeError as err:
+                return on_fail(err.args[0] if err.args else err)
+            except Exception as err:
+                return on_invalid(err)
+            return self.set_solution("optimal_powerflow",solution,result)
 
         # setup verbose output
         if verbose is True:
@@ -1128,18 +3386,18 @@ class Model:
                 ref = self.select({"class":"bus","type":"REF"})
                 if len(ref) > 0:
                     if len(ref) > 1:
-                        warnings.warn(f"{self.name} multiple reference busses found {ref}, using bus {ref[0]}")
-                    ref = ref[list(ref)[0]]["bus_i"]
+                        warnings.warn(f"{self.name} multiple reference busses found {list(ref)}, using bus {list(ref)[0]}")
+                    ref = self.get_index("bus",list(ref)[0])
                 else:
                     warnings.warn(f"{self.name} no reference bus found, using bus 0")
                     ref = 0
             elif isinstance(ref,str):
-                ref = self.get_bus(ref)
+                ref = self.get_index("bus",self.get_bus(ref))
            
             P = self.prices(refresh)
-            G = self.graphLaplacian(refresh)
+            G = self.graphLaplacian(refresh,sparse)
             D = self.demand('actual',refresh)
-            I = self.graphIncidence(refresh,complex_flows)
+            I = self.graphIncidence(refresh,complex_flows,sparse=sparse)
             F = self.lineratings("A",refresh)
             S = self.generation('capacity',refresh)
             C = self.capacitors('installed',refresh, verbose)
@@ -1156,6 +3414,7 @@ class Model:
                 f"{ref=},"
                 f"{angle_limit=},"
                 f"{voltage_limit=},"
+                f"{sparse=},"
                 f"{on_invalid=},"
                 f"{on_fail=},"
                 f"{',' if kwargs else ''}{','.join([f'{x}={repr(y)}' for x,y in kwargs.items()])}):",
@@ -1175,41 +3434,31 @@ class Model:
             print("\nTotal C:",sum(C),sep="\n",file=verbose)
 
    
-        # setup problem
-        x = cp.Variable(N)  # nodal voltage angles
-        y = cp.Variable(N)  # nodal voltage magnitudes
-        g = cp.Variable(N)  # generation real power dispatch
-        h = cp.Variable(N)  # generation reactive power dispatch
-        c = cp.Variable(N)  # capacitor bank settings
-        d = cp.Variable(N)  # demand real power curtailment
-        e = cp.Variable(N)  # demand reactive power curtailment
-        #TODO: checking if adding synchronous condensor settins work 
-        r = cp.Variable(N)
-
+        # setup problem (reuses the compiled problem when the network is unchanged)
         try:
-            cost = P @ ( cp.abs(g + h * 1j))
             if curtailment_price is None:
                 curtailment_price = 100*max(P) # default load shedding 100x maximum generator price
-            shed = np.ones(N)*curtailment_price @ cp.abs(d+e*1j) 
-            objective = cp.Minimize(cost + shed)  # minimum cost (generation + demand response)
-            constraints = [
-                #NOTE: original constraint
-                G.real @ x - g + c + D.real - d - r == 0,  # KCL/KVL real power laws
-                G.imag @ y - h - c + D.imag - e + r == 0,  # KCL/KVL reactive power laws
-                x[ref] == 0,  # swing bus voltage angle always 0
-                y[ref] == 1,  # swing bus voltage magnitude is always 1
-                cp.abs(y - 1) <= voltage_limit,  # limit voltage magnitude to 5% deviation
-                cp.abs(I.real@x + I.imag@y) <= F,  # line flow limits,
-                g >= 0,  # generation real power limits
-                cp.abs(h) <= S.imag,  # generation reactive power limits
-                cp.abs(g+h*1j) <= S.real, # generation apparent power limit
-                0 <= c, c <= C, # capacitor bank settings
-                r <= cp.abs(R), 
-                d >= 0, cp.abs(d+e*1j) <= cp.abs(D),  # demand curtailment constraint with flexible reactive power
-                ]
-            problem = cp.Problem(objective, constraints)
-            problem.solve(verbose=(verbose!=False),**kwargs)
-            self.problem = problem.get_problem_data(solver=problem.solver_stats.solver_name)
+            opf = self._compiled_problem("optimal_powerflow",(ref,complex_flows,sparse),[G,I],
+                lambda G,I: self._powerflow_problem(G,I,ref))
+            values = {
+                "prices": P,
+                "curtailment_price": np.ones(N)*curtailment_price,
+                "demand_real": D.real,
+                "demand_reactive": D.imag,
+                "demand_magnitude": np.abs(D),
+                "generation_real": S.real,
+                "generation_reactive": S.imag,
+                "capacitors": C,
+                "condensers": np.abs(R),
+                "lineratings": F,
+                "voltage_limit": voltage_limit,
+                }
+            for name,parameter in opf["parameters"].items():
+                parameter.value = values[name]
+            problem = opf["problem"]
+            x,y,g,h,c,d,e,r = opf["variables"].values()
+            self._solve(problem,opf["variables"],warm_start,verbose=(verbose!=False),**kwargs)
+            self._solved = {"problem":problem,"solver":kwargs.get("solver")}
 
         except Exception as err:
             return on_invalid(err)
@@ -1248,8 +3497,9 @@ class Model:
                 "status": status,
             }
 
-        return self.set_result("optimal_powerflow",result) #NOTE: original was - self.set_result("optimal_sizing",result)
+        return self.set_solution("optimal_powerflow",solution,result) #NOTE: original was - self.set_result("optimal_sizing",result)
 
+    @_refresh_pass
     def optimal_sizing(self,            
             refresh:bool=False,
             verbose:bool|TypeVar('io.TextIOWrapper')=False,
@@ -1269,6 +3519,10 @@ class Model:
             generator_expansion_limit=None,
             reactive_power_constraint=0.2,
             complex_flows:bool= True, 
+            sparse:bool=False,
+            split_islands:bool=False,
+            max_workers:int=None,
+            warm_start:Union[bool,dict]=True,
             on_invalid=_problem_invalid,
             on_fail=_solver_failed,
             **kwargs) -> dict:
@@ -1287,7 +3541,7 @@ class Model:
         * voltage_low: lower voltage constraint
         * steps: number of capacitor steps
         * admittance: capacity admittance per step
-        * ref: reference bus id or name
+        * ref: reference bus index or object name
         * angle_limit: voltage angle accuracy limit
         * voltage_limit: voltage magnitude violation limit
         * generator_expansion_limit: limits generation addition to bus where generation is already present
@@ -1295,6 +3549,10 @@ class Model:
         * on_invalid: invalid problem handler
         * on_fail: failed solution handler
         * complex_flows: if true creates a complex graph incidence matrix
+        * sparse: use sparse graph Laplacian and incidence matrices
+        * split_islands: solve each network separately when there are several
+        * max_workers: number of processes used to solve networks (1 for none)
+        * warm_start: solution to start from, True for the last solution found, or False for a cold start (see `_solve()`)
         * kwargs: arguments passed to solver
 
         Returns:
@@ -1302,17 +3560,73 @@ class Model:
 
         """
 
-        try:
-            if not refresh and not update_model:
-                return self.get_result("optimal_sizing")
-        except:
-            pass
+        self._solved = None # cleared until a problem is solved (not on cached or split solutions)
+        solution = self._solution_name("optimal_sizing",{
+            "margin": margin,
+            "gen_cost": gen_cost,
+            "cap_cost": cap_cost,
+            "con_cost": con_cost,
+            "min_power_ratio": min_power_ratio,
+            "voltage_high": voltage_high,
+            "voltage_low": voltage_low,
+            "steps": steps,
+            "admittance": admittance,
+            "ref": ref,
+            "angle_limit": angle_limit,
+            "voltage_limit": voltage_limit,
+            "generator_expansion_limit": generator_expansion_limit,
+            "reactive_power_constraint": reactive_power_constraint,
+            "complex_flows": complex_flows,
+            "sparse": sparse,
+            "split_islands": split_islands,
+            }|kwargs,refresh)
+        if not refresh and not update_model and solution in self.results:
+            return self.get_solution(solution)
+        result = None if refresh or update_model else self.load_solution(solution)
+        if result:
+            return self.set_solution("optimal_sizing",solution,result)
 
         # check model network validity
-        if self.graphSpectral()[2] > 1:
-            return on_invalid(f"{self.name} cannot optimize more than one network at a time (model has {self.graphSpectral()[2]} networks)")
-        if self.graphSpectral()[2] == 0:
-            return on_invalid(f"{self.name} cannot optimize on invalid network models (no zero eigenvalues found)")
+        islands = self.graphIslands()[0]
+        if islands > 1 and not split_islands:
+            return on_invalid(f"{self.name} cannot optimize more than one network at a time (model has {islands} networks)")
+        if islands == 0:
+            return on_invalid(f"{self.name} cannot optimize on invalid network models (no busses found)")
+        if islands > 1:
+            try:
+                N = len(self.nodes(refresh))
+                cap_cost = self._bus_values(cap_cost,N,np.zeros(N))
+                busdata = {
+                    "gen_cost": self._bus_values(gen_cost,N,np.zeros(N)),
+                    "cap_cost": cap_cost,
+                    "con_cost": self._bus_values(con_cost,N,cap_cost*10),
+                    "min_power_ratio": self._bus_values(min_power_ratio,N,np.zeros(N)),
+                    }
+                result = self._solve_islands("optimal_sizing",{
+                        "margin": margin,
+                        "voltage_high": voltage_high,
+                        "voltage_low": voltage_low,
+                        "steps": steps,
+                        "admittance": admittance,
+                        "angle_limit": angle_limit,
+                        "voltage_limit": voltage_limit,
+                        "generator_expansion_limit": generator_expansion_limit,
+                        "reactive_power_constraint": reactive_power_constraint,
+                        "complex_flows": complex_flows,
+                        "sparse": sparse,
+                        }|kwargs,
+                    busdata,max_workers,ref)
+            except RuntimeError as err:
+                return on_fail(err.args[0] if err.args else err)
+            except Exception as err:
+                return on_invalid(err)
+            if update_model:
+                additions = result["additions"]
+                self.update_model(busdata["min_power_ratio"],voltage_high,voltage_low,
+                    [additions["generation"].get(n,0) for n in range(N)],
+                    [additions["capacitors"].get(n,0) for n in range(N)],
+                    sys.stderr if verbose is True else verbose)
+            return self.set_solution("optimal_sizing",solution,result)
         
         # setup verbose output
         if verbose is True:
@@ -1324,59 +3638,27 @@ class Model:
                 ref = self.select({"class":"bus","type":"REF"})
                 if len(ref) > 0:
                     if len(ref) > 1:
-                        warnings.warn(f"{self.name} multiple reference busses found {ref}, using bus {ref[0]}")
-                    ref = ref[list(ref)[0]]["bus_i"]
+                        warnings.warn(f"{self.name} multiple reference busses found {list(ref)}, using bus {list(ref)[0]}")
+                    ref = self.get_index("bus",list(ref)[0])
                 else:
                     warnings.warn(f"{self.name} no reference bus found, using bus 0")
                     ref = 0
             elif isinstance(ref,str):
-                ref = self.get_bus(ref)
+                ref = self.get_index("bus",self.get_bus(ref))
 
-            G = self.graphLaplacian(refresh)
+            G = self.graphLaplacian(refresh,sparse)
             D = self.demand('actual',refresh)
-            I = self.graphIncidence(refresh,complex_flows)
+            I = self.graphIncidence(refresh,complex_flows,sparse=sparse)
             F = self.lineratings("A",refresh)
             S = self.generation('capacity',refresh)
             C = self.capacitors('installed',refresh)
             N = len(self.nodes(refresh))
 
-            # normalize generation cost argument
-            if gen_cost is None:
-                gen_cost = np.zeros(N)
-            elif isinstance(gen_cost,float) or isinstance(gen_cost,int):
-                gen_cost = np.full(N,gen_cost)
-            elif isinstance(gen_cost,dict):
-                gen_cost = np.array([gen_cost[n] if n in gen_cost else 0 for n in range(N)])
-            elif isinstance(gen_cost,list):
-                gen_cost = np.array(gen_cost)
-
-            # normalize capacitor cost argument
-            if cap_cost is None:
-                cap_cost = np.zeros(N)
-            elif isinstance(cap_cost,float) or isinstance(cap_cost,int):
-                cap_cost = np.full(N,cap_cost)
-            elif isinstance(cap_cost,dict):
-                cap_cost = np.array([cap_cost[n] if n in cap_cost else 0 for n in range(N)])
-            elif isinstance(cap_cost,list):
-                cap_cost = np.array(cap_cost)
-
-            # normalize condenser cost argument
-            if con_cost is None:
-                con_cost = cap_cost*10
-            elif isinstance(con_cost,float) or isinstance(con_cost,int):
-                con_cost = np.full(N,con_cost)
-            elif isinstance(con_cost,dict):
-                con_cost = np.array([con_cost[n] if n in con_cost else cap_cost[n]*10 for n in range(N)])
-            elif isinstance(con_cost,list):
-                con_cost = np.array(con_cost)
-
-            # normalize minimum reactive power argument
-            if isinstance(min_power_ratio,float):
-                min_power_ratio = np.full(N,min_power_ratio)
-            elif isinstance(min_power_ratio,dict):
-                min_power_ratio = np.array([min_power_ratio[n] if n in min_power_ratio else 0 for n in range(N)])
-            elif isinstance(min_power_ratio,list):
-                min_power_ratio = np.array(min_power_ratio)
+            # normalize per-bus cost arguments
+            gen_cost = self._bus_values(gen_cost,N,np.zeros(N))
+            cap_cost = self._bus_values(cap_cost,N,np.zeros(N))
+            con_cost = self._bus_values(con_cost,N,cap_cost*10)
+            min_power_ratio = self._bus_values(min_power_ratio,N,np.zeros(N))
 
         except Exception as err:
 
@@ -1398,6 +3680,7 @@ class Model:
                 f"{ref=},"
                 f"{angle_limit=},"
                 f"{voltage_limit=},"
+                f"{sparse=},"
                 f"{on_invalid=},"
                 f"{on_fail=},"
                 f"verbose={repr(verbose)}"
@@ -1414,36 +3697,30 @@ class Model:
             print("\nTotal S:",sum(S),sep="\n",file=verbose)
             print("\nTotal C:",sum(C),sep="\n",file=verbose)
 
-        # setup problem
-        x = cp.Variable(N)  # nodal voltage angles
-        y = cp.Variable(N)  # nodal voltage magnitudes
-        g = cp.Variable(N)  # generation real power dispatch
-        h = cp.Variable(N)  # generation reactive power dispatch
-        c = cp.Variable(N)  # capacitor bank settings
-
+        # setup problem (reuses the compiled problem when the network is unchanged)
         try:
-
-            # construct problem
             puS = self.perunit("S")
-            costs = cp.abs(gen_cost) @ cp.abs(g) + cp.abs(gen_cost.imag) @ cp.abs(h) + (cap_cost+con_cost)/2 @ cp.abs(c) + (cap_cost-con_cost)/2 @ c
-            objective = cp.Minimize(costs)  # minimum cost (generation + demand response)
-            constraints = [
-                g - G.real @ x + c - D.real*(1+margin) == 0,  # KCL/KVL real power laws
-                h - G.imag @ y - c - D.imag*(1+margin) == 0,  # KCL/KVL reactive power laws
-                x[ref] == 0,  # swing bus voltage angle always 0
-                y[ref] == 1,  # swing bus voltage magnitude is always 1
-                cp.abs(y - 1) <= voltage_limit,  # limit voltage magnitude to 5% deviation
-                cp.abs(I @ x) <= F,  # line flow limits
-                g >= 0, # generation must be positive
-                cp.abs(h) <= reactive_power_constraint*g # limit how much reactive power a generator can produce
-                ]
-            if not generator_expansion_limit is None:
-                # limit where and how much generation can be added
-                constraints.append(cp.abs(g+h*1j) <= generator_expansion_limit*cp.abs(S))
-
-            problem = cp.Problem(objective, constraints)
-            problem.solve(verbose=(verbose!=False),**kwargs)
-            self.problem = problem.get_problem_data(solver=problem.solver_stats.solver_name)
+            expansion = generator_expansion_limit is not None
+            osp = self._compiled_problem("optimal_sizing",(ref,complex_flows,sparse,expansion),[G,I],
+                lambda G,I: self._sizing_problem(G,I,ref,expansion))
+            values = {
+                "gen_cost_real": np.abs(gen_cost),
+                "gen_cost_reactive": np.abs(gen_cost.imag),
+                "cap_cost_magnitude": (cap_cost+con_cost)/2,
+                "cap_cost_sign": (cap_cost-con_cost)/2,
+                "demand_real": D.real*(1+margin),
+                "demand_reactive": D.imag*(1+margin),
+                "voltage_limit": voltage_limit,
+                "reactive_power_constraint": np.ones(N)*reactive_power_constraint,
+                "lineratings": F,
+                "generation_limit": generator_expansion_limit*np.abs(S) if expansion else None,
+                }
+            for name,parameter in osp["parameters"].items():
+                parameter.value = values[name]
+            problem = osp["problem"]
+            x,y,g,h,c = osp["variables"].values()
+            self._solve(problem,osp["variables"],warm_start,verbose=(verbose!=False),**kwargs)
+            self._solved = {"problem":problem,"solver":kwargs.get("solver")}
 
         except Exception as err:
 
@@ -1482,7 +3759,128 @@ class Model:
                 "status": status,
             }
 
-        return self.set_result("optimal_sizing",result)
+        return self.set_solution("optimal_sizing",solution,result)
+
+    def sizing_sweep(self,grid:dict,**kwargs) -> dict:
+        """Solve the optimal sizing/placement problem over a grid of arguments
+
+        Arguments:
+        * grid: list of values by `optimal_sizing()` argument name, e.g.,
+          "gen_cost", "cap_cost", "con_cost", or "margin"
+        * kwargs: other `optimal_sizing()` arguments used for all grid points
+
+        Returns:
+        * dict: "grid" (the arguments of each point) and the "status", "cost",
+          "generation", "capacitors", "condensers", "magnitude", "angle", and
+          "flows" results stacked with one row per grid point
+
+        The grid points are the cartesian product of the lists of values. The
+        compiled problem is reused for all the points, and each point starts
+        from the solution of the previous one when the solver supports warm
+        starts. The results of points that fail are NaN. The solutions are
+        not added to the model, so `update_model` cannot be given.
+        """
+        if "update_model" in kwargs or "update_model" in grid:
+            raise ValueError("sizing sweeps cannot update the model")
+        fields = ["cost","generation","capacitors","condensers","magnitude","angle","flows"]
+        points = [dict(zip(grid,x)) for x in itertools.product(*grid.values())]
+        kwargs = {"warm_start":True,"on_fail":lambda err:None}|kwargs
+        results = [self.optimal_sizing(**(kwargs|x),update_model=False) for x in points]
+        template = next((x for x in results if x),None)
+        result = {"grid":points,"status":np.array([x["status"] if x else "failed" for x in results],dtype=object)}
+        for field in fields:
+            if template is None:
+                result[field] = np.full(len(points),np.nan)
+                continue
+            shape = np.shape(template[field])
+            dtype = np.result_type(template[field],float)
+            result[field] = np.stack([np.asarray(x[field],dtype=dtype) if x else np.full(shape,np.nan,dtype=dtype) for x in results]) \
+                if points else np.zeros((0,)+shape,dtype=dtype)
+        return result
+
+    scenario_changes = ["demand","outages","costs","options"]
+
+    def run_scenarios(self,
+            scenarios:list[dict],
+            method:str="optimal_powerflow",
+            max_workers:int=None,
+            chunksize:int=1,
+            **kwargs) -> Iterator[dict]:
+        """Solve an optimization on scenarios of the model
+
+        Arguments:
+        * scenarios: list of scenario changes (see below)
+        * method: 'optimal_powerflow' or 'optimal_sizing'
+        * max_workers: number of worker processes (1 solves in this process)
+        * chunksize: number of scenarios sent to a worker process at a time
+        * kwargs: optimization arguments used for all scenarios
+
+        Returns:
+        * Iterator[dict]: solution of each scenario in order (None when the
+          solver fails, or the error when the scenario problem is invalid,
+          unless `on_fail` or `on_invalid` are given)
+
+        Each scenario is a dict of changes to the model, all optional:
+        * demand: scale factor of all the bus demands, or scale factors by bus
+          name
+        * outages: list of branch names removed from the network
+        * costs: gencost costs (string or list of coefficients) by gencost name
+        * options: optimization arguments for this scenario
+
+        The network objects of the model are sent once to each worker process,
+        which keeps a base model and applies the changes of each scenario to
+        it only while the scenario is solved. Scenarios without outages thus
+        reuse the worker's compiled problem. Solutions are returned as soon as
+        they are available in the order of the scenarios. The sizing solutions
+        are not added to the model. The method and the scenario changes are
+        checked when this is called, and handlers given must be picklable
+        when worker processes are used.
+        """
+        if method not in ["optimal_powerflow","optimal_sizing"]:
+            raise ValueError(f"method '{method}' is not valid")
+        for scenario in scenarios:
+            for name in scenario:
+                if name not in self.scenario_changes:
+                    raise ValueError(f"scenario change '{name}' is not valid")
+            for change,oclass in [("demand","bus"),("costs","gencost"),("outages","branch")]:
+                names = scenario.get(change,[])
+                for name in names if isinstance(names,(list,dict)) else []:
+                    if self.data["objects"].get(name,{}).get("class") != oclass:
+                        raise ValueError(f"scenario {change} {oclass} '{name}' not found")
+        kwargs = {"on_fail":_scenario_failed,"on_invalid":_scenario_invalid}|kwargs
+        if method == "optimal_sizing":
+            kwargs["update_model"] = False
+        data = {x:y for x,y in self.data.items() if x != "objects"}
+        data["objects"] = {x:y for oclass in self.network_classes for x,y in self.find(oclass,dict).items()}
+        return self._run_scenarios(data,scenarios,method,max_workers,chunksize,kwargs)
+
+    def _run_scenarios(self,data:dict,scenarios:list[dict],method:str,max_workers:int,chunksize:int,kwargs:dict) -> Iterator[dict]:
+        """Generate the solutions of scenarios (see `run_scenarios()`)"""
+        if max_workers == 1:
+            model = Model(json.loads(json.dumps(data)),validate=[])
+            for scenario in scenarios:
+                yield model._solve_scenario(scenario,method,kwargs)
+        else:
+            with ProcessPoolExecutor(max_workers,initializer=_scenario_init,initargs=(data,)) as pool:
+                yield from pool.map(_solve_scenario,scenarios,itertools.repeat(method),itertools.repeat(kwargs),chunksize=chunksize)
+
+    def _solve_scenario(self,scenario:dict,method:str,kwargs:dict) -> dict:
+        """Solve an optimization with the changes of a scenario (see `run_scenarios()`)"""
+        demand = scenario.get("demand",{})
+        if not isinstance(demand,dict):
+            demand = dict.fromkeys(self.find("bus",list),demand)
+        changes = {x:{y:self.get_property(x,y,astype=float)*z for y in ["Pd","Qd"]} for x,z in demand.items()}
+        for name,costs in scenario.get("costs",{}).items():
+            changes[name] = {"costs":costs if isinstance(costs,str) else ",".join(str(x) for x in costs)}
+        restore = {x:{y:self.data["objects"][x][y] for y in z} for x,z in changes.items()}
+        outages = scenario.get("outages",[])
+        model = Model(self.data|{"objects":{x:y for x,y in self.data["objects"].items() if x not in outages}},validate=[]) \
+            if outages else self
+        try:
+            model.mod_objects(changes)
+            return getattr(model,method)(**(kwargs|scenario.get("options",{})))
+        finally:
+            model.mod_objects(restore)
 
     #
     # PyPOWER
@@ -1636,7 +4034,7 @@ def {os.path.splitext(os.path.basename(self.name))[0]}():
         def _line(line,spec):
             fbus = spec["tbus"]
             tbus = spec["fbus"]
-            names = self.get_name('bus',[int(fbus)-1,int(tbus)-1])
+            names = self.get_name('bus',self.bus_index([int(fbus),int(tbus)]))
             baseKV = self.get_property(names[0],"baseKV")
             baseZ = baseKV**2/baseMVA
             voltages = self.get_property(names,["Vm","Va"])
@@ -1667,7 +4065,7 @@ def {os.path.splitext(os.path.basename(self.name))[0]}():
             return f"""    {fbus} {linetype}{current:.2f} kA<br>{power*baseMVA:.1f} MVA{linetype}> {tbus}"""
 
         for line,spec in self.find("branch").items():
-            if self.get_name("bus",int(spec["fbus"])-1) in busses or self.get_name("bus",int(spec["tbus"])-1) in busses:
+            if any(x in busses for x in self.get_name("bus",self.bus_index([int(spec["fbus"]),int(spec["tbus"])]))):
                 diagram.append(_line(line,spec))
 
         if showpopup == True or isinstance(showpopup,list):
@@ -1739,8 +4137,14 @@ if __name__ == "__main__":
     testException(lambda:test.add_object("bus","bus_0"),ValueError,"add object failed")
     testException(lambda:test.add_object("transformer","test"),ValueError,"add object failed")
     testEq(test.add_object("geodata","test",scale=0.1),{'class': 'geodata', 'id': "13", 'scale': '0.1 pu'},"add object failed")
+    testEq(test.find("geodata",list),["test"],"find added object failed")
     testEq(test.mod_object("test",scale=1.0),{'class': 'geodata', 'id': "13", 'scale': '1.0 pu'},"mod object failed")
     testEq(test.del_object("test"),{'class': 'geodata', 'id': "13", 'scale': '1.0 pu'},"add object failed")
+    testEq(test.find("geodata",list),[],"find deleted object failed")
+    testEq([x["id"] for x in test.add_objects({"test1":{"class":"geodata","scale":0.1},"test2":{"class":"geodata"}}).values()],["14","15"],"add objects failed")
+    testEq(test.mod_objects({"test1":{"scale":2.0},"test2":{"scale":3.0}})["test2"]["scale"],"3.0 pu","mod objects failed")
+    testException(lambda:test.add_objects({"test3":{"class":"geodata","id":"14"}}),ValueError,"add objects succeeded")
+    testEq([test.del_object(x)["class"] for x in ["test1","test2"]],["geodata","geodata"],"del objects failed")
 
     # content tests
     print("TEST: testing model contents",file=sys.stderr,flush=True)
@@ -1750,23 +4154,41 @@ if __name__ == "__main__":
     testEq(test.globals(dict)["country"],"US", "globals dict failed" )
     testEq(test.globals("country"),"US", "globals get failed")
     testEq(test.find("bus",list),['bus_0', 'bus_1', 'bus_2', 'bus_3'], "find list failed")
+    testEq(Model("example.json",classes=["bus"]).find("branch",list),[],"selective load failed")
+    testEq(list(Model("example.json",classes=["bus"],keep_raw=True,validate=[]).raw_objects)[:2],["gen_0","gencost:1"],"selective load raw failed")
+    testEq(_load_json(io.StringIO('{"objects":{"a":{"class":"bus","x":"}{"},"b":{"class":"gen","y":{"z":"}"}},"c":{"class":"bus"}}}'),["bus"],True,8),
+        ({"objects":{"a":{"class":"bus","x":"}{"},"c":{"class":"bus"}}},{"b":'{"class":"gen","y":{"z":"}"}}'}),"selective load parse failed")
     testEq([y['bus_i'] for y in test.find("bus",dict).values()],['1','2','3','4'], "find dict failed")
     testEq(list(test.select({"class":"bus","type":"REF"})),['bus_0'],"select failed")
+    testEq(list(test.select({"class":"gen","bus":"1"})),['gen_0'],"select indexed failed")
+    testEq(list(test.select({"parent":"gen_0"})),['gencost:1'],"select indexed failed")
+    testEq(list(test.select({"class":"gen","bus":["1"]})),[],"select unhashable value failed")
     testEq(test.get_name('bus') , ['bus_0', 'bus_1', 'bus_2', 'bus_3'], "get bus name failed")
     testEq(test.get_name('bus',0) , 'bus_0', "get bus name failed")
     testEq(test.get_name('bus',[1,2]) , ['bus_1', 'bus_2'], "get bus name failed")
     testEq(test.get_name('branch') , ['branch:6', 'branch:7', 'branch:8'], "get branch failed")
     testEq(test.get_name('branch',0) , 'branch:6', "get branch failed")
     testEq(test.get_name('branch',[1,2]) , ['branch:7', 'branch:8'], "get branch failed")
+    testEq(test.get_name('bus',np.array([2,0])) , ['bus_2', 'bus_0'], "get bus names failed")
+    testEq([test.get_index('bus','bus_2'),test.get_index('branch',['branch:8','branch:6']).tolist()] , [2,[2,0]], "get index failed")
+    testEq([test.bus_index(3),test.bus_index([4,1]).tolist()] , [2,[3,0]], "bus index failed")
+    testException(lambda:test.bus_index(5),ValueError,"bus index succeeded")
     testEq(test.get_bus("gen_0") , "bus_0", "get bus failed")
     testEq(test.get_bus(["gen_0"]) , ["bus_0"], "get bus failed")
     testEq(test.get_property("bus_0","Pd"),0.0, "property float failed")
     testEq(test.get_property("bus_0","S"),0j, "property complex failed")
+    testEq(test.column("bus","bus_i").tolist(),[1,2,3,4], "column int failed")
+    testEq(test.column("bus","baseKV").tolist(),[12.5,12.5,12.5,12.5], "column double failed")
+    testEq(test.column("gen","name").tolist(),["gen_0"], "column name failed")
     testEq(test.perunit("S"),100, "perunit power failed")
     testEq(test.perunit("V"),[12.5, 12.5, 12.5, 12.5], "perunit voltage failed")
     testEq(test.perunit("Z"),[1.5625, 1.5625, 1.5625], "perunit impedance failed")
     testEq(test.graphLaplacian().shape,(4,4), "graph Laplacian failed")
     testEq(test.graphIncidence().shape,(3,4), "graph incidence failed")
+    testEq(test.graphLaplacian(sparse=True).toarray().tolist(),test.graphLaplacian().tolist(), "sparse graph Laplacian failed")
+    testEq(test.graphIncidence(sparse=True).toarray().tolist(),test.graphIncidence().tolist(), "sparse graph incidence failed")
+    testEq(test.graphIslands()[0],1, "graph islands failed")
+    testEq(test.graphSpectral(count=2)[2],test.graphSpectral()[2], "partial graph spectral failed")
     testEq(test.demand().tolist(),[0j,0j,0.1+0.01j,0.1+0.01j], "demand failed")
     testEq(list(test.generators().keys()) , ['gen_0'], "generators failed")
     testEq(test.generation().tolist() , [(0.1+0.05j), 0j, 0j, 0j], "generation failed")
@@ -1782,6 +4204,103 @@ if __name__ == "__main__":
         test.optimal_powerflow()["curtailment"].round(1).tolist(),
         [0.0, 0.0, 6.8, 6.8],
         "optimal powerflow failed")
+    testEq(
+        test.optimal_powerflow(refresh=True,split_islands=True,max_workers=1)["curtailment"].round(1).tolist(),
+        test.optimal_powerflow(refresh=True)["curtailment"].round(1).tolist(),
+        "split optimal powerflow failed")
+    problem = test._problems["optimal_powerflow"]["problem"]
+    test.optimal_powerflow(refresh=True)
+    testEq(test._problems["optimal_powerflow"]["problem"] is problem,True,"compiled optimal powerflow reuse failed")
+    testEq(test._refreshed,None,"refreshed optimization column pass failed")
+    test._refreshed = set()
+    testEq(test.column("bus","Pd",True) is test.column("bus","Pd",True),True,"refreshed optimization column reuse failed")
+    test._refreshed = None
+    testEq(test.column("bus","Pd",True) is test.column("bus","Pd",True),False,"column refresh failed")
+    testEq(
+        test._solve_islands("optimal_powerflow",{},max_workers=1,ref="bus_1")["voltage"].round(3).tolist(),
+        test.optimal_powerflow(refresh=True,ref="bus_1")["voltage"].round(3).tolist(),
+        "split optimal powerflow reference bus failed")
+    testException(lambda:test._solve_islands("optimal_powerflow",{},max_workers=1,ref=9),ValueError,"split optimal powerflow invalid reference bus succeeded")
+    testEq(test.optimal_powerflow() is test.optimal_powerflow(),True,"optimal powerflow solution cache failed")
+    testEq(test.optimal_powerflow(voltage_limit=0.06) is test.optimal_powerflow(),False,"optimal powerflow solution arguments failed")
+    testEq(test.optimal_powerflow(refresh=True,warm_start=False)["cost"],test.optimal_powerflow(refresh=True,warm_start=test.optimal_powerflow())["cost"],"optimal powerflow warm start failed")
+    periods = test.multiperiod_powerflow(np.outer([1,1],test.demand()*test.perunit("S")))
+    testEq(periods["cost"].round(1).tolist(),[round(test.optimal_powerflow()["cost"],1)]*2,"multiperiod powerflow failed")
+    testEq(test.multiperiod_powerflow(np.outer([1,1],test.demand()*test.perunit("S")),chunksize=1)["cost"].round(1).tolist(),periods["cost"].round(1).tolist(),"multiperiod powerflow chunks failed")
+    test.data["schedules"]["test"] = "* 0-11 * * 1-5 0.8; * * * * * 1.2"
+    testEq(test.schedule("test",np.array(["2025-01-06T06:00","2025-01-06T18:00","2025-01-05T06:00"],dtype="datetime64[m]")).tolist(),[0.8,1.2,1.2],"schedule failed")
+    del test.data["schedules"]["test"]
+    output = io.StringIO()
+    test.export_problem(output,"cbf")
+    testEq(output.getvalue().split("\n")[:2],["VER","3"],"export problem failed")
+    test.optimal_powerflow()
+    testEq(test.problem,None,"cached solution problem failed")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        test.optimal_powerflow(refresh=True,solver="SCIPY")
+    testException(lambda:test.export_problem(io.StringIO(),"cbf"),ValueError,"export non-conic problem succeeded")
+    laplacian = test.graphLaplacian()
+    test.mod_object("bus_2",Pd=test.get_property("bus_2","Pd"))
+    testEq(test.graphLaplacian() is laplacian,True,"dependency invalidation failed")
+    demand = test.demand()
+    test.set_property("bus_2",Pd=test.get_property("bus_2","Pd")+1)
+    testEq((test.demand()-demand).real.round(6).tolist(),(np.eye(len(demand))[test.get_index("bus","bus_2")]/test.perunit("S")).round(6).tolist(),"set property invalidation failed")
+    test.set_property("bus_2",Pd=test.get_property("bus_2","Pd")-1)
+    Pd = test.data["objects"]["bus_2"]["Pd"]
+    test.data["objects"]["bus_2"]["Pd"] = "1.5 MW"
+    testEq(test.demand(refresh=True)[test.get_index("bus","bus_2")].real*test.perunit("S"),1.5,"demand refresh failed")
+    test.data["objects"]["bus_2"]["Pd"] = Pd
+    test.demand(refresh=True)
+    testEq(test.find("bus",list),['bus_0', 'bus_1', 'bus_2', 'bus_3'],"find after modify failed")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cost = Model("example.json",cache_dir=cache_dir).optimal_powerflow()["cost"]
+        testEq(sorted(x.split(".")[-1] for x in os.listdir(cache_dir)),["json","npz"],"save solution failed")
+        cached = Model("example.json",cache_dir=cache_dir)
+        testEq([cached.optimal_powerflow()["cost"],cached._problems],[cost,{}],"load solution failed")
+        renumbered = Model("example.json",cache_dir=cache_dir)
+        renumbered.mod_objects({"bus_2":{"bus_i":renumbered.get_property("bus_3","bus_i")},"bus_3":{"bus_i":renumbered.get_property("bus_2","bus_i")}})
+        renumbered.optimal_powerflow(on_fail=lambda err:None)
+        testEq(list(renumbered._problems),["optimal_powerflow"],"load solution bus numbers failed")
+        test.save_snapshot(os.path.join(cache_dir,"example.snap"))
+        snapshot = Model.load_snapshot(os.path.join(cache_dir,"example.snap"))
+        testEq([snapshot.find("gen",dict),sorted(snapshot.data["objects"]._pending)],[test.find("gen",dict),["branch","bus","capacity","gencost"]],"model snapshot lazy load failed")
+        testEq([snapshot.data,snapshot.column("bus","Pd").tolist()],[test.data,test.column("bus","Pd").tolist()],"model snapshot failed")
+        test.save(os.path.join(cache_dir,"example.json.gz"))
+        testEq(Model(os.path.join(cache_dir,"example.json.gz")).data,test.data,"compressed model failed")
+        compact = Model("example.json",compact=True)
+        testEq(["rank" in compact.data["objects"]["bus_0"],compact.get_property("bus_0","rank")],[False,test.get_property("bus_0","rank")],"compact model failed")
+        compact.save(os.path.join(cache_dir,"compact.json"))
+        with open(os.path.join(cache_dir,"compact.json")) as fh, open("example.json") as fe:
+            testEq(json.load(fh),json.load(fe),"compact model save failed")
+    fingerprints = test.fingerprints()
+    Pd = test.data["objects"]["bus_2"]["Pd"]
+    test.mod_object("bus_2",Pd="1 MW")
+    testEq([x for x,y in test.fingerprints().items() if fingerprints[x] != y],["bus"],"class fingerprints failed")
+    test.mod_object("bus_2",Pd=Pd)
+    testEq(test.fingerprints(),fingerprints,"class fingerprints failed")
+    fingerprint = test.fingerprint()
+    test.data["schedules"]["test"] = "* * * * * 1"
+    testEq([test.fingerprint(),test.fingerprint(refresh=True) != fingerprint],[fingerprint,True],"model fingerprint schedules failed")
+    del test.data["schedules"]["test"]
+    testEq(test.fingerprint(refresh=True),fingerprint,"model fingerprint failed")
+    invalid = Model("example.json",validation="off")
+    invalid.data["objects"]["gen_0"]["bogus"] = "0"
+    invalid.data["objects"]["gen_0"]["parent"] = "bus_9"
+    testEq([len(invalid.validate(level=x)) for x in ["off","structural","full"]],[0,1,2],"validation levels failed")
+    testException(lambda:invalid.validate(level="none"),ValueError,"validation level succeeded")
+    cache = ResultCache(100)
+    cache["a"] = np.zeros(10)
+    cache["b"] = np.zeros(10)
+    testEq([list(cache),cache.evictions,"a" in cache,cache.misses],[["b"],1,False,1],"result cache eviction failed")
+    cache["c"] = cache["b"]
+    testEq([cache.nbytes,cache.sizes["c"]],[cache.sizes["b"]]*2,"result cache shared size failed")
+    del cache["b"]
+    testEq([list(cache),cache.nbytes],[["c"],cache.sizes["c"]],"result cache shared delete failed")
+    cache = ResultCache(100,Model.borrowed_results)
+    cache["a"] = np.zeros(10)
+    cache["nodes"] = test.find("bus")
+    cache["shunts"] = test.shunts()
+    testEq([list(cache),cache.nbytes],[["a","nodes","shunts"],80],"result cache object data failed")
     testEq(test.optimal_sizing(
             refresh=True,
             gen_cost=np.array([100,500,1000,1000])+1000j,
@@ -1790,6 +4309,17 @@ if __name__ == "__main__":
             )["generation"].round(1).tolist(),
         [(26.4+0j), 0j, 0j, 0j], 
         "optimal sizing failed")
+    sweep = test.sizing_sweep({"margin":[0.2,0.5]},gen_cost=np.array([100,500,1000,1000])+1000j,cap_cost={0:1000,1:500})
+    testEq([sweep["generation"].shape,sweep["cost"].tolist()],
+        [(2,4),[test.optimal_sizing(margin=x,gen_cost=np.array([100,500,1000,1000])+1000j,cap_cost={0:1000,1:500})["cost"] for x in [0.2,0.5]]],
+        "sizing sweep failed")
+    testException(lambda:test.sizing_sweep({"margin":[0.2]},update_model=True),ValueError,"sizing sweep update succeeded")
+    scenarios = [{},{"demand":1.1},{"outages":["branch:6"]},{"options":{"voltage_limit":0.06}}]
+    results = list(test.run_scenarios(scenarios,max_workers=1))
+    testEq([round(x["cost"],2) for x in results[:2]]+[type(results[2])],[round(test.optimal_powerflow()["cost"],2),1220.97,ValueError],"run scenarios failed")
+    testEq([x.get("cost") for x in test.run_scenarios(scenarios,max_workers=2) if isinstance(x,dict)],[x["cost"] for x in results if isinstance(x,dict)],"run scenarios workers failed")
+    testException(lambda:test.run_scenarios([{"bogus":1}]),ValueError,"run scenarios invalid change succeeded")
+    testException(lambda:test.run_scenarios([{"outages":["bus_2"]}]),ValueError,"run scenarios invalid outage succeeded")
     testEq(test.optimal_sizing(
             refresh=True,
             gen_cost=np.array([100,500,1000,1000])+1000j,